@@ -1,19 +1,30 @@
 from __future__ import annotations
 
 import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from heapq import merge
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, TextIO
 
 import typer
 from rich import box
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 
 from taskinder.core import TaskService
-from taskinder.models.task import TaskStatus
+from taskinder.models.task import TaskStatus, TaskSummary
 from taskinder.storage.task_repository import TaskRepository
 
+if TYPE_CHECKING:
+    from taskinder.scanner.todo_scanner import TodoItem, TodoScanner
+
 app = typer.Typer(
     name="taskinder",
     help="Taskinder — per-project task manager (TUI + CLI)",
@@ -26,19 +37,21 @@ app.add_typer(theme_app, name="theme")
 console = Console()
 
 
-def _get_service(cwd: Path | None = None) -> tuple[TaskService, TaskRepository]:
+@contextmanager
+def _open_service(
+    cwd: Path | None = None,
+) -> Iterator[tuple[TaskService, TaskRepository]]:
     project_dir = cwd or Path.cwd()
     db_path = project_dir / ".taskinder" / "tasks.db"
-    repo = TaskRepository(db_path)
-    return TaskService(repo), repo
+    with TaskRepository(db_path) as repo:
+        yield TaskService(repo), repo
 
 
 def _resolve_task(task_id: str, service: TaskService, repo: TaskRepository):
     task = repo.find_by_id(task_id)
     if task:
         return task
-    all_tasks = service.get_all_tasks()
-    matches = [t for t in all_tasks if t.id.startswith(task_id)]
+    matches = service.get_tasks_by_id_prefix(task_id, limit=2)
     if len(matches) == 1:
         return matches[0]
     if len(matches) > 1:
@@ -48,11 +61,58 @@ def _resolve_task(task_id: str, service: TaskService, repo: TaskRepository):
     raise typer.Exit(1)
 
 
+def _write_json_array(out: TextIO, items: Iterable[dict]) -> None:
+    """Write ``items`` as an indented JSON array, one element at a time."""
+    first = True
+    for item in items:
+        body = json.dumps(item, indent=2, default=str).replace("\n", "\n  ")
+        out.write(("[\n  " if first else ",\n  ") + body)
+        first = False
+    out.write("[]\n" if first else "\n]\n")
+
+
+def _print_task_table(tasks: list[TaskSummary]) -> None:
+    if not tasks:
+        console.print("[dim]No tasks found.[/dim]")
+        return
+
+    icons = {TaskStatus.TODO: "○", TaskStatus.DOING: "◑", TaskStatus.DONE: "●"}
+    colors = {
+        TaskStatus.TODO: "yellow",
+        TaskStatus.DOING: "blue",
+        TaskStatus.DONE: "green",
+    }
+
+    table = Table(box=box.ROUNDED, show_header=True, header_style="bold")
+    table.add_column("ID", style="dim", width=10)
+    table.add_column("Status", width=14)
+    table.add_column("Title")
+    table.add_column("Description", style="dim")
+
+    for task in tasks:
+        icon = icons[task.status]
+        color = colors[task.status]
+        table.add_row(
+            task.id[:8],
+            f"[{color}]{icon}  {task.status.value}[/{color}]",
+            task.title,
+            task.preview[:50],
+        )
+
+    console.print(table)
+
+
 @app.callback()
-def main_callback(ctx: typer.Context) -> None:
+def main_callback(
+    ctx: typer.Context,
+    watch: bool = typer.Option(
+        False, "--watch", "-w", help="Keep the TODO list up to date while the TUI runs"
+    ),
+) -> None:
     if ctx.invoked_subcommand is None:
         from taskinder.tui.app import TaskinderApp
-        TaskinderApp().run()
+
+        TaskinderApp(watch=watch).run()
 
 
 @app.command()
@@ -61,22 +121,32 @@ def summary(
 ) -> None:
     """Print a FastFetch-style task summary (great for .zshrc)."""
     project_dir = dir or Path.cwd()
-    service, repo = _get_service(project_dir)
 
     try:
         display = "~/" + str(project_dir.relative_to(Path.home()))
     except ValueError:
         display = str(project_dir)
 
-    counts = repo.count()
-    tasks = service.get_all_tasks()
+    with _open_service(project_dir) as (service, repo):
+        counts = repo.count()
+        # One indexed read per status, five rows each, instead of sorting
+        # every open task to find the newest five.
+        newest = (
+            service.query_summaries(status=status, limit=5)
+            for status in (TaskStatus.TODO, TaskStatus.DOING)
+        )
+        pending = list(
+            islice(merge(*newest, key=lambda t: t.created_at, reverse=True), 5)
+        )
 
-    if not tasks:
-        console.print(Panel(
-            f"[bold]  Taskinder[/bold]  [dim]{display}[/dim]\n"
-            "[dim]No tasks yet. Run [/dim][bold]taskinder add \"your task\"[/bold]",
-            border_style="dim",
-        ))
+    if not sum(counts.values()):
+        console.print(
+            Panel(
+                f"[bold]  Taskinder[/bold]  [dim]{display}[/dim]\n"
+                '[dim]No tasks yet. Run [/dim][bold]taskinder add "your task"[/bold]',
+                border_style="dim",
+            )
+        )
         return
 
     todo = counts.get("TODO", 0)
@@ -85,18 +155,17 @@ def summary(
 
     lines = [
         f"[bold]  Taskinder[/bold]  [dim]{display}[/dim]",
-        f"[yellow]󰄱[/yellow] {todo} todo  [blue]󰑓[/blue] {doing} in progress  [green]󰄲[/green] {done} done",
+        f"[yellow]󰄱[/yellow] {todo} todo  [blue]󰑓[/blue] {doing} in progress  "
+        f"[green]󰄲[/green] {done} done",
         "",
     ]
-    pending = [t for t in tasks if t.status != TaskStatus.DONE][:5]
     for task in pending:
         color = "yellow" if task.status == TaskStatus.TODO else "blue"
         icon = "󰄱" if task.status == TaskStatus.TODO else "󰑓"
         lines.append(f"  [{color}]{icon}[/{color}]  {task.title}")
-    if len(pending) == 5:
-        remaining = sum(1 for t in tasks if t.status != TaskStatus.DONE) - 5
-        if remaining > 0:
-            lines.append(f"  [dim]... and {remaining} more[/dim]")
+    remaining = todo + doing - len(pending)
+    if remaining > 0:
+        lines.append(f"  [dim]... and {remaining} more[/dim]")
 
     console.print(Panel("\n".join(lines), border_style="bright_black"))
 
@@ -105,76 +174,132 @@ def summary(
 def add_task(
     title: str = typer.Argument(..., help="Task title"),
     description: str = typer.Option("", "--desc", "-d", help="Task description"),
-    status: str = typer.Option("TODO", "--status", "-s", help="Status: TODO, DOING, DONE"),
+    status: str = typer.Option(
+        "TODO", "--status", "-s", help="Status: TODO, DOING, DONE"
+    ),
 ) -> None:
     """Add a new task to the current project."""
-    service, _ = _get_service()
     try:
         s = TaskStatus(status.upper())
     except ValueError:
         console.print(f"[red]Invalid status: {status}. Use TODO, DOING or DONE.[/red]")
         raise typer.Exit(1)
 
-    task = service.create_task(title, description)
-    if s != TaskStatus.TODO:
-        service.update_task_by_id(task.id, status=s)
-    console.print(f"[green]✓[/green] Created: [bold]{title}[/bold]  [dim]({task.id[:8]})[/dim]")
+    with _open_service() as (service, _):
+        task = service.create_task(title, description, status=s)
+    console.print(
+        f"[green]✓[/green] Created: [bold]{title}[/bold]  [dim]({task.id[:8]})[/dim]"
+    )
 
 
 @app.command(name="list")
 def list_tasks(
-    status: Optional[str] = typer.Option(None, "--status", "-s", help="Filter by status"),
+    status: Optional[str] = typer.Option(
+        None, "--status", "-s", help="Filter by status"
+    ),
+    limit: Optional[int] = typer.Option(
+        None, "--limit", "-n", help="Show at most N tasks"
+    ),
+    sort: str = typer.Option(
+        "-created",
+        "--sort",
+        help="created, updated or title; prefix with - for descending",
+    ),
+    since: Optional[str] = typer.Option(
+        None, "--since", help="Only tasks updated since this ISO date/time"
+    ),
+    after: Optional[str] = typer.Option(
+        None, "--after", help="Start after this task ID or prefix (next page)"
+    ),
     as_json: bool = typer.Option(False, "--json", help="Output as JSON"),
+    as_jsonl: bool = typer.Option(
+        False, "--jsonl", help="Output one JSON object per line"
+    ),
 ) -> None:
     """List tasks in the current project."""
-    service, _ = _get_service()
-
+    s = None
     if status:
         try:
             s = TaskStatus(status.upper())
-            tasks = service.get_task_by_status(s)
         except ValueError:
             console.print(f"[red]Invalid status: {status}[/red]")
             raise typer.Exit(1)
-    else:
-        tasks = service.get_all_tasks()
-
-    if as_json:
-        print(json.dumps([t.to_dict() for t in tasks], indent=2, default=str))
-        return
 
-    if not tasks:
-        console.print("[dim]No tasks found.[/dim]")
-        return
+    updated_since = None
+    if since:
+        try:
+            updated_since = datetime.fromisoformat(since)
+        except ValueError:
+            console.print(
+                f"[red]Invalid date: {since}. Use ISO format, e.g. 2024-05-01[/red]"
+            )
+            raise typer.Exit(1)
 
-    icons = {TaskStatus.TODO: "○", TaskStatus.DOING: "◑", TaskStatus.DONE: "●"}
-    colors = {TaskStatus.TODO: "yellow", TaskStatus.DOING: "blue", TaskStatus.DONE: "green"}
+    with _open_service() as (service, repo):
+        after_id = _resolve_task(after, service, repo).id if after else None
+        filters = dict(
+            status=s,
+            updated_since=updated_since,
+            order_by=sort,
+            limit=limit,
+            after=after_id,
+        )
+        try:
+            if as_json or as_jsonl:
+                stream = service.iter_query(**filters)
+            else:
+                tasks = service.query_summaries(**filters)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            raise typer.Exit(1)
 
-    table = Table(box=box.ROUNDED, show_header=True, header_style="bold")
-    table.add_column("ID", style="dim", width=10)
-    table.add_column("Status", width=14)
-    table.add_column("Title")
-    table.add_column("Description", style="dim")
+        if as_jsonl:
+            for task in stream:
+                sys.stdout.write(json.dumps(task.to_dict(), default=str) + "\n")
+            return
+        if as_json:
+            _write_json_array(sys.stdout, (task.to_dict() for task in stream))
+            return
+
+    _print_task_table(tasks)
+
+
+@app.command(name="search")
+def search_tasks(
+    query: str = typer.Argument(
+        ..., help='Words to find (prefix match) or "an exact phrase"'
+    ),
+    status: Optional[str] = typer.Option(
+        None, "--status", "-s", help="Filter by status"
+    ),
+    limit: int = typer.Option(20, "--limit", "-n", help="Show at most N results"),
+    as_json: bool = typer.Option(False, "--json", help="Output as JSON"),
+) -> None:
+    """Full-text search over task titles and descriptions."""
+    s = None
+    if status:
+        try:
+            s = TaskStatus(status.upper())
+        except ValueError:
+            console.print(f"[red]Invalid status: {status}[/red]")
+            raise typer.Exit(1)
 
-    for task in tasks:
-        icon = icons[task.status]
-        color = colors[task.status]
-        table.add_row(
-            task.id[:8],
-            f"[{color}]{icon}  {task.status.value}[/{color}]",
-            task.title,
-            task.description[:50] if task.description else "",
-        )
+    with _open_service() as (service, _):
+        if as_json:
+            tasks = service.search(query, status=s, limit=limit)
+            _write_json_array(sys.stdout, (task.to_dict() for task in tasks))
+            return
+        summaries = service.search_summaries(query, status=s, limit=limit)
 
-    console.print(table)
+    _print_task_table(summaries)
 
 
 @app.command(name="done")
 def mark_done(task_id: str = typer.Argument(..., help="Task ID or prefix")) -> None:
     """Mark a task as done."""
-    service, repo = _get_service()
-    task = _resolve_task(task_id, service, repo)
-    service.update_task_by_id(task.id, status=TaskStatus.DONE)
+    with _open_service() as (service, repo):
+        task = _resolve_task(task_id, service, repo)
+        service.update_task_by_id(task.id, status=TaskStatus.DONE)
     console.print(f"[green]✓[/green] Done: [bold]{task.title}[/bold]")
 
 
@@ -184,11 +309,11 @@ def delete_task(
     yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation prompt"),
 ) -> None:
     """Delete a task."""
-    service, repo = _get_service()
-    task = _resolve_task(task_id, service, repo)
-    if not yes and not typer.confirm(f"Delete '{task.title}'?"):
-        return
-    service.delete_task_by_id(task.id)
+    with _open_service() as (service, repo):
+        task = _resolve_task(task_id, service, repo)
+        if not yes and not typer.confirm(f"Delete '{task.title}'?"):
+            return
+        service.delete_task_by_id(task.id)
     console.print(f"[red]✗[/red] Deleted: [bold]{task.title}[/bold]")
 
 
@@ -200,9 +325,6 @@ def edit_task(
     status: Optional[str] = typer.Option(None, "--status", "-s"),
 ) -> None:
     """Edit a task's fields via CLI."""
-    service, repo = _get_service()
-    task = _resolve_task(task_id, service, repo)
-
     s = None
     if status:
         try:
@@ -211,45 +333,208 @@ def edit_task(
             console.print(f"[red]Invalid status: {status}[/red]")
             raise typer.Exit(1)
 
-    service.update_task_by_id(task.id, title=title, description=description, status=s)
+    with _open_service() as (service, repo):
+        task = _resolve_task(task_id, service, repo)
+        updated = service.update_task_by_id(
+            task.id, title=title, description=description, status=s
+        )
+        task = updated or task
     console.print(f"[green]✓[/green] Updated: [bold]{task.title}[/bold]")
 
 
+_KIND_COLORS = {
+    "TODO": "blue",
+    "FIXME": "red",
+    "HACK": "yellow",
+    "NOTE": "green",
+    "XXX": "magenta",
+}
+
+
+def _todo_line(item: TodoItem, prefix: str = "") -> Text:
+    return Text.assemble(
+        prefix,
+        (f"{item.kind:<5}", _KIND_COLORS.get(item.kind, "white")),
+        "  ",
+        (f"{item.file}:{item.line}", "dim"),
+        "  ",
+        item.text,
+    )
+
+
 @app.command(name="scan")
 def scan_todos(
     dir: Optional[Path] = typer.Option(None, "--dir", "-D", help="Directory to scan"),
-    import_all: bool = typer.Option(False, "--import", "-i", help="Import all as tasks"),
+    import_all: bool = typer.Option(
+        False,
+        "--import",
+        "-i",
+        help="Import items as tasks, skipping ones already imported",
+    ),
+    sync: bool = typer.Option(
+        False,
+        "--sync",
+        help="Import new items, update moved ones and close resolved ones",
+    ),
+    watch: bool = typer.Option(
+        False, "--watch", "-w", help="Keep running and report items as files change"
+    ),
+    jobs: Optional[int] = typer.Option(
+        None, "--jobs", "-j", min=1, help="Parallel workers (default: CPU count)"
+    ),
+    processes: bool = typer.Option(
+        False, "--processes", help="Use worker processes instead of threads"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Read every file instead of using the scan index"
+    ),
+    no_ignore: bool = typer.Option(
+        False,
+        "--no-ignore",
+        help="Don't honour .gitignore/.ignore/.taskinderignore files",
+    ),
 ) -> None:
     """Scan source files for TODO/FIXME/HACK/NOTE comments."""
+    from taskinder.scanner.config import load_config
     from taskinder.scanner.todo_scanner import TodoScanner
+    from taskinder.storage.todo_index import TodoIndex
 
-    project_dir = dir or Path.cwd()
-    scanner = TodoScanner()
-    items = scanner.scan(project_dir)
+    if watch and no_cache:
+        raise typer.BadParameter("--watch needs the scan index; drop --no-cache.")
 
-    if not items:
-        console.print("[dim]No TODOs found.[/dim]")
-        return
+    project_dir = dir or Path.cwd()
+    try:
+        load_config(project_dir)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    items: list[TodoItem] = []
+    with _open_service(project_dir) as (service, repo):
+        index = None if no_cache else TodoIndex(repo.database)
+        scanner = TodoScanner(
+            jobs=jobs, processes=processes, index=index, ignore_files=not no_ignore
+        )
+        # Print items as they are found rather than waiting for the whole
+        # tree, a batch at a time: one console write per line is slow.
+        batch: list[Text] = []
+        flushed = time.monotonic()
+        for item in scanner.iter_scan(project_dir):
+            items.append(item)
+            batch.append(_todo_line(item))
+            if time.monotonic() - flushed >= 0.1:
+                console.print(Text("\n").join(batch), soft_wrap=True)
+                batch = []
+                flushed = time.monotonic()
+        if batch:
+            console.print(Text("\n").join(batch), soft_wrap=True)
+        items.sort(key=lambda x: (x.file, x.line))
+
+        if not items:
+            console.print("[dim]No TODOs found.[/dim]")
+        else:
+            console.print(f"\n[bold]{len(items)} item(s) found[/bold]")
+        _apply_todos(service, items, import_all, sync)
+
+        if watch:
+            _watch_todos(scanner, project_dir, service, items, import_all, sync)
+
+
+def _apply_todos(
+    service: TaskService, items: list[TodoItem], import_all: bool, sync: bool
+) -> None:
+    if sync:
+        result = service.sync_tasks(item.task_fields() for item in items)
+        console.print(
+            f"[green]✓[/green] Synced: {result.added} added, {result.updated} updated, "
+            f"{result.resolved} marked done."
+        )
+    elif import_all and items:
+        created = service.import_tasks(item.task_fields() for item in items)
+        console.print(f"[green]✓[/green] Imported {created} new item(s) as tasks.")
+
+
+def _watch_todos(
+    scanner: TodoScanner,
+    project_dir: Path,
+    service: TaskService,
+    items: list[TodoItem],
+    import_all: bool,
+    sync: bool,
+) -> None:
+    """Print added (+) and removed (-) items after every burst of changes."""
+    from taskinder.scanner.watcher import TodoWatcher
+
+    watcher = TodoWatcher(scanner, project_dir)
+    known = {item.fingerprint: item for item in items}
+
+    def on_change() -> None:
+        nonlocal known
+        current = scanner.index.items()
+        by_fingerprint = {item.fingerprint: item for item in current}
+        lines = [
+            _todo_line(item, "+ ") for item in current if item.fingerprint not in known
+        ]
+        lines += [
+            _todo_line(item, "- ")
+            for fingerprint, item in known.items()
+            if fingerprint not in by_fingerprint
+        ]
+        # An edited or moved item keeps its fingerprint, but its task's
+        # title or description still has to follow.
+        moved = sync and any(
+            item.task_fields() != known[fingerprint].task_fields()
+            for fingerprint, item in by_fingerprint.items()
+            if fingerprint in known
+        )
+        known = by_fingerprint
+        if lines:
+            console.print(Text("\n").join(lines), soft_wrap=True)
+        if lines or moved:
+            _apply_todos(service, current, import_all, sync)
+
+    console.print(
+        f"[dim]Watching {project_dir} ({watcher.backend}), Ctrl+C to stop.[/dim]"
+    )
+    try:
+        watcher.run(
+            on_change, threading.Event(), lambda e: console.print(f"[red]{e}[/red]")
+        )
+    except KeyboardInterrupt:
+        pass
 
-    kind_colors = {"TODO": "blue", "FIXME": "red", "HACK": "yellow", "NOTE": "green", "XXX": "magenta"}
 
-    table = Table(box=box.ROUNDED, title=f"{len(items)} item(s) found", header_style="bold")
-    table.add_column("Kind", width=7)
-    table.add_column("File", style="dim")
-    table.add_column("Line", justify="right", style="dim", width=6)
-    table.add_column("Text")
+@app.command(name="todos")
+def list_todos(
+    dir: Optional[Path] = typer.Option(None, "--dir", "-D", help="Project directory"),
+    kind: Optional[list[str]] = typer.Option(
+        None, "--kind", "-k", help="Only this kind, e.g. FIXME (repeatable)"
+    ),
+    file: Optional[str] = typer.Option(
+        None, "--file", "-f", help="Only files matching this glob, e.g. 'src/*'"
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Output as JSON"),
+) -> None:
+    """Query the TODO items recorded by the last scan, without rescanning."""
+    from dataclasses import asdict
 
-    for item in items:
-        color = kind_colors.get(item.kind, "white")
-        table.add_row(f"[{color}]{item.kind}[/{color}]", item.file, str(item.line), item.text)
+    from taskinder.storage.todo_index import TodoIndex
 
-    console.print(table)
+    with _open_service(dir or Path.cwd()) as (_, repo):
+        items = TodoIndex(repo.database).query(kinds=kind, file_glob=file)
 
-    if import_all:
-        service, _ = _get_service(project_dir)
-        for item in items:
-            service.create_task(f"{item.kind}: {item.text}", f"From {item.file}:{item.line}")
-        console.print(f"[green]✓[/green] Imported {len(items)} item(s) as tasks.")
+    if as_json:
+        _write_json_array(sys.stdout, (asdict(item) for item in items))
+        return
+    if not items:
+        hint = (
+            ""
+            if kind or file
+            else " Run [bold]taskinder scan[/bold] to index the project."
+        )
+        console.print(f"[dim]No TODOs found.{hint}[/dim]")
+        return
+    console.print(Text("\n").join(_todo_line(item) for item in items), soft_wrap=True)
+    console.print(f"\n[bold]{len(items)} item(s)[/bold]")
 
 
 @theme_app.command(name="list")
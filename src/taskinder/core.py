@@ -1,7 +1,23 @@
-from typing import List, Optional
+import asyncio
 import uuid
-from .models.task import Task, TaskStatus
-from .storage.task_repository import TaskRepository
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Iterator, List, Optional, TypeVar
+
+from .models.task import Task, TaskStatus, TaskSummary
+from .storage.task_repository import SyncResult, TaskChanges, TaskRepository
+
+
+def _new_tasks(
+    items: Iterable[tuple[str, str, str]], now: datetime
+) -> Iterator[tuple[str, Task]]:
+    """``(fingerprint, task)`` pairs for ``(fingerprint, title, description)``
+    triples, created a microsecond apart so that lists ordered by creation
+    time keep the order of ``items``."""
+    for i, (fingerprint, title, description) in enumerate(items):
+        at = now + timedelta(microseconds=i)
+        task = Task(str(uuid.uuid4()), title, description, TaskStatus.TODO, at, at)
+        yield fingerprint, task
 
 
 class TaskService:
@@ -15,10 +31,107 @@ class TaskService:
         """Get a task by its id."""
         return self._repository.find_by_id(task_id)
 
+    def get_tasks_by_id_prefix(self, prefix: str, limit: int = 2) -> List[Task]:
+        """Get up to ``limit`` tasks whose id starts with ``prefix``."""
+        return self._repository.find_by_id_prefix(prefix, limit)
+
     def get_task_by_title(self, task_title: str) -> List[Task]:
         """Get tasks by their title."""
         return self._repository.find_by_title(task_title)
 
+    def iter_tasks(self, batch_size: int = 500) -> Iterator[Task]:
+        """Stream every task, newest first, without loading them all at once."""
+        return self._repository.iter_tasks(batch_size=batch_size)
+
+    def iter_query(
+        self,
+        status: TaskStatus | Iterable[TaskStatus] | None = None,
+        text: Optional[str] = None,
+        created_since: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        order_by: str = "-created",
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        batch_size: int = 500,
+    ) -> Iterator[Task]:
+        """Filter, sort and page tasks in the database, streaming the results.
+
+        ``order_by`` is one of ``created``, ``updated`` or ``title``, prefixed
+        with ``-`` for descending order. ``after`` is the id of the last task
+        of the previous page.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("Limit cannot be negative.")
+        return self._repository.iter_query(
+            status=status,
+            text=text,
+            created_since=created_since,
+            updated_since=updated_since,
+            order_by=order_by,
+            limit=limit,
+            after=after,
+            batch_size=batch_size,
+        )
+
+    def query(self, **filters) -> List[Task]:
+        """Like ``iter_query``, but returns a list."""
+        return list(self.iter_query(**filters))
+
+    def iter_summaries(self, **filters) -> Iterator[TaskSummary]:
+        """Like ``iter_query``, but yields lightweight ``TaskSummary`` rows.
+
+        Use for list views; load the full ``Task`` with ``get_task_by_id``
+        only when its whole description is needed.
+        """
+        limit = filters.get("limit")
+        if limit is not None and limit < 0:
+            raise ValueError("Limit cannot be negative.")
+        return self._repository.iter_summaries(**filters)
+
+    def query_summaries(self, **filters) -> List[TaskSummary]:
+        """Like ``iter_summaries``, but returns a list."""
+        return list(self.iter_summaries(**filters))
+
+    def search(
+        self,
+        query: str,
+        status: TaskStatus | Iterable[TaskStatus] | None = None,
+        limit: Optional[int] = 50,
+    ) -> List[Task]:
+        """Full-text search over task titles and descriptions.
+
+        Words match as prefixes, ``"quoted text"`` matches as a phrase, and
+        results come back best match first.
+        """
+        return self._repository.search(query, status=status, limit=limit)
+
+    def search_summaries(
+        self,
+        query: str,
+        status: TaskStatus | Iterable[TaskStatus] | None = None,
+        limit: Optional[int] = 50,
+    ) -> List[TaskSummary]:
+        """Like ``search``, but returns lightweight ``TaskSummary`` rows."""
+        return self._repository.search_summaries(query, status=status, limit=limit)
+
+    def count(self) -> dict[str, int]:
+        """Number of tasks per status name."""
+        return self._repository.count()
+
+    def data_version(self) -> int:
+        """Moves whenever another connection writes to the database."""
+        return self._repository.data_version()
+
+    def latest_change(self) -> int:
+        """Sequence number of the newest task change; see ``changes_since``."""
+        return self._repository.latest_change()
+
+    def changes_since(self, seq: int) -> Optional[TaskChanges]:
+        """Tasks added, changed or deleted after change ``seq``, from any
+        connection; None when they can no longer be told apart from a full
+        reload."""
+        return self._repository.changes_since(seq)
+
     def get_task_by_status(self, status: TaskStatus) -> List[Task]:
         if not isinstance(status, TaskStatus):
             raise TypeError(
@@ -26,15 +139,50 @@ class TaskService:
             )
         return self._repository.find_by_status(status)
 
-    def create_task(self, title: str, description: str) -> Task:
-        """Creates a new task."""
+    def create_task(
+        self,
+        title: str,
+        description: str,
+        status: TaskStatus = TaskStatus.TODO,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
+        task_id: Optional[str] = None,
+    ) -> Task:
+        """Creates a new task with a single insert.
+
+        ``task_id`` lets a caller that already shows the task pick its id.
+        """
         if not title:
             raise ValueError("Title cannot be empty.")
 
-        new_task = Task(id=str(uuid.uuid4()), title=title, description=description)
+        now = datetime.now()
+        new_task = Task(
+            id=task_id or str(uuid.uuid4()),
+            title=title,
+            description=description,
+            status=status,
+            created_at=created_at or now,
+            updated_at=updated_at or created_at or now,
+        )
         self._repository.add(new_task)
         return new_task
 
+    def import_tasks(self, items: Iterable[tuple[str, str, str]]) -> int:
+        """Creates tasks from ``(fingerprint, title, description)`` triples.
+
+        Items whose fingerprint already belongs to a task are skipped, so
+        importing the same source twice is harmless. Returns the number of
+        tasks created.
+        """
+        return self._repository.add_fingerprinted(_new_tasks(items, datetime.now()))
+
+    def sync_tasks(self, items: Iterable[tuple[str, str, str]]) -> SyncResult:
+        """Makes fingerprinted tasks mirror ``(fingerprint, title, description)``
+        triples: new ones are created, changed ones updated and open tasks
+        that are no longer listed are marked done, in one transaction."""
+        tasks = dict(_new_tasks(items, datetime.now()))
+        return self._repository.sync_fingerprinted(tasks)
+
     def update_task_by_id(
         self,
         task_id: str,
@@ -42,25 +190,109 @@ class TaskService:
         description: Optional[str] = None,
         status: Optional[TaskStatus] = None,
     ) -> Optional[Task]:
-        """Updates a task's attributes."""
-        task = self.get_task_by_id(task_id)
-        if not task:
+        """Updates a task's attributes and returns the updated task."""
+        if title is None and description is None and status is None:
+            return self.get_task_by_id(task_id)
+        return self._repository.update_fields(
+            task_id, title=title, description=description, status=status
+        )
+
+    def delete_task_by_id(self, task_id: str) -> Optional[Task]:
+        """Deletes a task by its ID and returns it, or None if there was none."""
+        try:
+            return self._repository.delete(task_id)
+        except ValueError:
             return None
 
-        if title is not None:
-            task.update_title(title)
-        if description is not None:
-            task.description = description
-        if status is not None:
-            task.update_status(status)
 
-        self._repository.update(task)
-        return task
+T = TypeVar("T")
 
-    def delete_task_by_id(self, task_id: str) -> bool:
-        """Deletes a task by its ID."""
-        try:
-            self._repository.delete(task_id)
-            return True
-        except ValueError:
-            return False
+
+class AsyncTaskService:
+    """Awaitable front for a ``TaskService``, for use from an event loop.
+
+    Every call is queued to one dedicated thread, with its own connection,
+    and runs there in the order it was made: the loop never waits on SQLite
+    and a write can't overtake an earlier one. Methods return asyncio
+    futures and must be called from the loop's thread.
+    """
+
+    def __init__(self, service: TaskService):
+        self.sync = service
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="taskinder-db"
+        )
+
+    def run(self, fn: Callable[..., T], *args, **kwargs) -> "asyncio.Future[T]":
+        """Queue any other database call, e.g. on the project's TODO index."""
+        return asyncio.wrap_future(self._executor.submit(fn, *args, **kwargs))
+
+    def get_task_by_id(self, task_id: str) -> "asyncio.Future[Optional[Task]]":
+        return self.run(self.sync.get_task_by_id, task_id)
+
+    def query_summaries(self, **filters) -> "asyncio.Future[List[TaskSummary]]":
+        return self.run(self.sync.query_summaries, **filters)
+
+    def search_summaries(
+        self,
+        query: str,
+        status: TaskStatus | Iterable[TaskStatus] | None = None,
+        limit: Optional[int] = 50,
+    ) -> "asyncio.Future[List[TaskSummary]]":
+        return self.run(self.sync.search_summaries, query, status=status, limit=limit)
+
+    def count(self) -> "asyncio.Future[dict[str, int]]":
+        return self.run(self.sync.count)
+
+    def data_version(self) -> "asyncio.Future[int]":
+        return self.run(self.sync.data_version)
+
+    def latest_change(self) -> "asyncio.Future[int]":
+        return self.run(self.sync.latest_change)
+
+    def changes_since(self, seq: int) -> "asyncio.Future[Optional[TaskChanges]]":
+        return self.run(self.sync.changes_since, seq)
+
+    def create_task(
+        self,
+        title: str,
+        description: str,
+        status: TaskStatus = TaskStatus.TODO,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
+        task_id: Optional[str] = None,
+    ) -> "asyncio.Future[Task]":
+        return self.run(
+            self.sync.create_task,
+            title,
+            description,
+            status,
+            created_at,
+            updated_at,
+            task_id,
+        )
+
+    def import_tasks(
+        self, items: Iterable[tuple[str, str, str]]
+    ) -> "asyncio.Future[int]":
+        # Materialised here: the caller's iterable may not be safe to read
+        # from the database thread.
+        return self.run(self.sync.import_tasks, list(items))
+
+    def update_task_by_id(
+        self,
+        task_id: str,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+    ) -> "asyncio.Future[Optional[Task]]":
+        return self.run(
+            self.sync.update_task_by_id, task_id, title, description, status
+        )
+
+    def delete_task_by_id(self, task_id: str) -> "asyncio.Future[Optional[Task]]":
+        return self.run(self.sync.delete_task_by_id, task_id)
+
+    def close(self) -> None:
+        """Finish the queued calls and stop the database thread."""
+        self._executor.shutdown(wait=True)
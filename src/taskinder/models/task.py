@@ -1,6 +1,6 @@
-from dataclasses import dataclass, asdict, field
-from enum import Enum
+from dataclasses import dataclass, field
 from datetime import datetime
+from enum import Enum
 
 
 class TaskStatus(Enum):
@@ -9,7 +9,27 @@ class TaskStatus(Enum):
     DONE = "DONE"
 
 
-@dataclass
+# Storage encoding: statuses are stored as small integers.
+STATUS_CODES: dict[TaskStatus, int] = {
+    TaskStatus.TODO: 0,
+    TaskStatus.DOING: 1,
+    TaskStatus.DONE: 2,
+}
+STATUS_BY_CODE: tuple[TaskStatus, ...] = (
+    TaskStatus.TODO,
+    TaskStatus.DOING,
+    TaskStatus.DONE,
+)
+
+# Characters of description kept in a TaskSummary preview. One extra
+# character is kept so callers can tell whether it was truncated.
+PREVIEW_LENGTH = 60
+
+_fromisoformat = datetime.fromisoformat
+_new = object.__new__
+
+
+@dataclass(slots=True)
 class Task:
     """Represents a task in the task management system."""
 
@@ -36,16 +56,92 @@ class Task:
 
     def to_dict(self) -> dict:
         """Convert the task to a dictionary, ready for serialization."""
-        data = asdict(self)
-        data["status"] = self.status.value
-        data["created_at"] = self.created_at.isoformat()
-        data["updated_at"] = self.updated_at.isoformat()
-        return data
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "status": self.status.value,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "Task":
         "Creates a instance of Task from dict."
-        data["status"] = TaskStatus(data["status"])
-        data["created_at"] = datetime.fromisoformat(data["created_at"])
-        data["updated_at"] = datetime.fromisoformat(data["updated_at"])
-        return cls(**data)
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            description=data["description"],
+            status=TaskStatus(data["status"]),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"]),
+        )
+
+    def to_row(self) -> tuple:
+        """Encode the task as a storage row, in ``from_row`` column order."""
+        return (
+            self.id,
+            self.title,
+            self.description,
+            STATUS_CODES[self.status],
+            self.created_at.isoformat(),
+            self.updated_at.isoformat(),
+        )
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Task":
+        """Build a task from an ``(id, title, description, status, created_at,
+        updated_at)`` storage row.
+
+        Rows are trusted: the fields are set directly, bypassing ``__init__``
+        and the status check in ``__post_init__``.
+        """
+        task = _new(cls)
+        task.id = row[0]
+        task.title = row[1]
+        task.description = row[2]
+        task.status = STATUS_BY_CODE[row[3]]
+        task.created_at = _fromisoformat(row[4])
+        task.updated_at = _fromisoformat(row[5])
+        return task
+
+
+@dataclass(slots=True)
+class TaskSummary:
+    """A lightweight view of a task for lists: no full description.
+
+    ``preview`` holds just the start of the description, one character
+    longer than what list views display, so they can tell it was cut.
+    """
+
+    id: str
+    title: str
+    status: TaskStatus
+    updated_at: datetime
+    preview: str
+    created_at: datetime
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "TaskSummary":
+        """Build a summary from an ``(id, title, status, updated_at, preview,
+        created_at)`` row."""
+        return cls(
+            row[0],
+            row[1],
+            STATUS_BY_CODE[row[2]],
+            _fromisoformat(row[3]),
+            row[4],
+            _fromisoformat(row[5]),
+        )
+
+    @classmethod
+    def from_task(cls, task: Task) -> "TaskSummary":
+        """The summary of a task already in memory, as a query would return it."""
+        return cls(
+            task.id,
+            task.title,
+            task.status,
+            task.updated_at,
+            task.description[: PREVIEW_LENGTH + 1],
+            task.created_at,
+        )
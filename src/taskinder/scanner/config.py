@@ -0,0 +1,252 @@
+import hashlib
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Mapping, Optional, Sequence
+
+# Project configuration, next to the task database.
+CONFIG_FILE = Path(".taskinder") / "config.json"
+
+DEFAULT_MARKERS = ("TODO", "FIXME", "HACK", "XXX", "NOTE")
+
+EXTENSIONS = frozenset(
+    {
+        ".py",
+        ".js",
+        ".ts",
+        ".tsx",
+        ".jsx",
+        ".go",
+        ".rs",
+        ".c",
+        ".cpp",
+        ".h",
+        ".hpp",
+        ".java",
+        ".kt",
+        ".swift",
+        ".rb",
+        ".php",
+        ".cs",
+        ".lua",
+        ".sh",
+        ".bash",
+        ".zsh",
+        ".fish",
+        ".r",
+        ".scala",
+        ".vue",
+        ".svelte",
+        ".html",
+        ".css",
+        ".scss",
+        ".sass",
+        ".toml",
+        ".yaml",
+        ".yml",
+    }
+)
+
+IGNORE_DIRS = frozenset(
+    {
+        ".git",
+        "__pycache__",
+        "node_modules",
+        ".venv",
+        "venv",
+        "dist",
+        "build",
+        ".taskinder",
+        ".tox",
+        "target",
+    }
+)
+
+# Comment leaders per family of languages.
+COMMENT_FAMILIES = {
+    "hash": ("#",),
+    "c": ("//", "/*", "*"),
+    "css": ("/*", "*"),
+    "dash": ("--",),
+    "sql": ("--", "/*", "*"),
+    "php": ("#", "//", "/*", "*"),
+    "hcl": ("#", "//", "/*", "*"),
+    "markup": ("<!--", "//", "/*", "*"),
+}
+
+# Suffix → family. Suffixes listed here are not scanned unless they are
+# also in ``extensions``; unknown suffixes accept every known leader.
+LANGUAGES = {
+    **dict.fromkeys(
+        (".py", ".rb", ".sh", ".bash", ".zsh", ".fish", ".r", ".toml", ".yaml", ".yml"),
+        "hash",
+    ),
+    **dict.fromkeys(
+        (
+            ".js",
+            ".ts",
+            ".tsx",
+            ".jsx",
+            ".go",
+            ".rs",
+            ".c",
+            ".cpp",
+            ".h",
+            ".hpp",
+            ".java",
+            ".kt",
+            ".swift",
+            ".cs",
+            ".scala",
+            ".scss",
+            ".sass",
+            ".proto",
+        ),
+        "c",
+    ),
+    ".css": "css",
+    ".lua": "dash",
+    ".sql": "sql",
+    ".php": "php",
+    ".tf": "hcl",
+    **dict.fromkeys((".html", ".vue", ".svelte"), "markup"),
+}
+
+_ALL_LEADERS = tuple(
+    dict.fromkeys(leader for leaders in COMMENT_FAMILIES.values() for leader in leaders)
+)
+
+# Bump when extraction changes so cached scan results are discarded.
+_FORMAT = 1
+
+
+@lru_cache(maxsize=64)
+def _compile(leaders: tuple[str, ...], markers: tuple[str, ...]) -> re.Pattern:
+    """One regex per comment family, covering every marker."""
+    leader = "|".join(map(re.escape, sorted(leaders, key=len, reverse=True)))
+    marker = "|".join(map(re.escape, sorted(markers, key=len, reverse=True)))
+    return re.compile(rf"(?:{leader})\s*({marker})\b\s*:?\s*(.+?)(?:\*/|-->)?\s*$")
+
+
+class ScannerConfig:
+    """What the scanner looks for, and where.
+
+    Markers, extensions and ignored directories extend the defaults.
+    ``comments`` maps a suffix to a family name from ``COMMENT_FAMILIES`` or
+    to its own list of comment leaders. Every suffix is dispatched to its
+    family's compiled pattern, so a hit line costs one regex match however
+    many markers are configured.
+    """
+
+    def __init__(
+        self,
+        markers: Iterable[str] = (),
+        extensions: Iterable[str] = (),
+        ignore_dirs: Iterable[str] = (),
+        comments: Optional[Mapping[str, str | Sequence[str]]] = None,
+    ) -> None:
+        self._settings = (
+            tuple(markers),
+            tuple(extensions),
+            tuple(ignore_dirs),
+            dict(comments or {}),
+        )
+        self.markers = tuple(dict.fromkeys((*DEFAULT_MARKERS, *markers)))
+        self.marker_bytes = tuple(marker.encode() for marker in self.markers)
+        self.extensions = EXTENSIONS | frozenset(extensions)
+        self.ignore_dirs = IGNORE_DIRS | frozenset(ignore_dirs)
+
+        leaders_by_suffix = {
+            suffix: COMMENT_FAMILIES[family] for suffix, family in LANGUAGES.items()
+        }
+        for suffix, value in (comments or {}).items():
+            if isinstance(value, str):
+                if value not in COMMENT_FAMILIES:
+                    raise ValueError(
+                        f"Unknown comment family '{value}' for {suffix}. "
+                        f"Available: {', '.join(COMMENT_FAMILIES)}"
+                    )
+                value = COMMENT_FAMILIES[value]
+            leaders_by_suffix[suffix] = tuple(value)
+        self._patterns = {
+            suffix: _compile(leaders, self.markers)
+            for suffix, leaders in leaders_by_suffix.items()
+        }
+        self._fallback = _compile(_ALL_LEADERS, self.markers)
+
+        # Only what changes extraction; extensions and ignores just change
+        # which files are walked, which the scan index handles by itself.
+        source = json.dumps(
+            [_FORMAT, self.markers, sorted(leaders_by_suffix.items())], sort_keys=True
+        )
+        self.digest = hashlib.blake2b(source.encode(), digest_size=8).hexdigest()
+
+    def __reduce__(self):
+        # Process pools get the raw settings and recompile on their side.
+        return (ScannerConfig, self._settings)
+
+    def pattern_for(self, name: str) -> re.Pattern:
+        """The compiled pattern for a file name, chosen by its suffix."""
+        dot = name.rfind(".")
+        if dot <= 0:
+            return self._fallback
+        return self._patterns.get(name[dot:], self._fallback)
+
+
+DEFAULT_CONFIG = ScannerConfig()
+
+
+def load_config(root: Path) -> ScannerConfig:
+    """The scanner configuration for the project at ``root``.
+
+    Read from the ``"scanner"`` section of ``.taskinder/config.json``; parsed
+    once and reused until the file changes.
+    """
+    path = root / CONFIG_FILE
+    try:
+        st = path.stat()
+    except OSError:
+        return DEFAULT_CONFIG
+    return _load_config(str(path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=8)
+def _load_config(path: str, mtime_ns: int, size: int) -> ScannerConfig:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Could not read {path}: {e}") from e
+    section = data.get("scanner", {}) if isinstance(data, dict) else None
+    if not isinstance(section, dict):
+        raise ValueError(f'{path}: "scanner" must be an object.')
+
+    def strings(key: str) -> list[str]:
+        value = section.get(key, [])
+        if not isinstance(value, list) or not all(
+            isinstance(v, str) and v for v in value
+        ):
+            raise ValueError(f'{path}: "scanner.{key}" must be a list of strings.')
+        return value
+
+    comments = section.get("comments", {})
+    if not isinstance(comments, dict) or not all(
+        isinstance(v, str)
+        or (isinstance(v, list) and all(isinstance(x, str) and x for x in v))
+        for v in comments.values()
+    ):
+        raise ValueError(
+            f'{path}: "scanner.comments" must map suffixes to a family name '
+            "or a list of comment leaders."
+        )
+    return ScannerConfig(
+        markers=strings("markers"),
+        extensions=[
+            ext if ext.startswith(".") else f".{ext}" for ext in strings("extensions")
+        ],
+        ignore_dirs=strings("ignore_dirs"),
+        comments={
+            (suffix if suffix.startswith(".") else f".{suffix}"): value
+            for suffix, value in comments.items()
+        },
+    )
@@ -0,0 +1,160 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional
+
+# Ignore files read in every directory, lowest precedence first.
+IGNORE_FILES = (".gitignore", ".ignore", ".taskinderignore")
+
+
+class _Pattern(NamedTuple):
+    regex: str
+    negate: bool
+    dir_only: bool
+
+
+def _translate_glob(glob: str) -> str:
+    """Translate one gitignore glob (no leading/trailing slash) into a regex."""
+    out: List[str] = []
+    i, n = 0, len(glob)
+    while i < n:
+        c = glob[i]
+        if c == "*":
+            if glob.startswith("**", i):
+                end = i + 2
+                segment_start = i == 0 or glob[i - 1] == "/"
+                if segment_start and end == n:
+                    out.append(".*")
+                    i = end
+                    continue
+                if segment_start and glob[end] == "/":
+                    out.append("(?:.*/)?")
+                    i = end + 1
+                    continue
+                i = end
+            else:
+                i += 1
+            out.append("[^/]*")
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and glob[j] in "!^":
+                j += 1
+            if j < n and glob[j] == "]":
+                j += 1
+            j = glob.find("]", j)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = glob[i + 1 : j].replace("\\", "\\\\")
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(glob[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _parse_line(line: str) -> Optional[_Pattern]:
+    line = line.rstrip("\n\r")
+    if not line or line.startswith("#"):
+        return None
+    # trailing spaces are dropped unless escaped with a backslash
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    negate = line.startswith("!")
+    if negate or line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    body = _translate_glob(line.lstrip("/"))
+    regex = f"^{body}$" if anchored else f"^(?:.*/)?{body}$"
+    return _Pattern(regex, negate, dir_only)
+
+
+class IgnoreRules:
+    """The gitignore patterns that apply to one directory.
+
+    Paths are matched relative to that directory with ``/`` separators. All
+    patterns are folded into one alternation per entry type, so the common
+    case (nothing matches) costs a single regex search. Only when the rules
+    contain negations is the last matching pattern looked up individually.
+    """
+
+    def __init__(self, patterns: List[_Pattern]) -> None:
+        self._patterns = patterns
+        self._any = self._combine(patterns)
+        self._any_file = self._combine([p for p in patterns if not p.dir_only])
+        self._has_negations = any(p.negate for p in patterns)
+        self._compiled = (
+            [(re.compile(p.regex), p) for p in patterns] if self._has_negations else []
+        )
+
+    @staticmethod
+    def _combine(patterns: List[_Pattern]) -> Optional[re.Pattern]:
+        if not patterns:
+            return None
+        return re.compile("|".join(f"(?:{p.regex})" for p in patterns))
+
+    @classmethod
+    def parse(cls, lines: Iterable[str]) -> "IgnoreRules":
+        return cls([p for p in map(_parse_line, lines) if p is not None])
+
+    def __bool__(self) -> bool:
+        return bool(self._patterns)
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """``True`` if ignored, ``False`` if re-included by a ``!`` pattern,
+        ``None`` if no pattern here applies."""
+        combined = self._any if is_dir else self._any_file
+        if combined is None or combined.match(path) is None:
+            return None
+        if not self._has_negations:
+            return True
+        for regex, pattern in reversed(self._compiled):
+            if pattern.dir_only and not is_dir:
+                continue
+            if regex.match(path):
+                return not pattern.negate
+        return None
+
+
+@lru_cache(maxsize=256)
+def compile_rules(text: str) -> IgnoreRules:
+    """Parse ignore-file contents, reusing the result for identical files."""
+    return IgnoreRules.parse(text.splitlines())
+
+
+def load_rules(
+    dir_path: str, names: Iterable[str], extra: str = ""
+) -> Optional[IgnoreRules]:
+    """Read the ignore files among ``names`` in ``dir_path``, in precedence order.
+
+    ``extra`` is prepended at the lowest precedence (used for
+    ``.git/info/exclude`` at the project root).
+    """
+    present = set(names)
+    chunks = [extra] if extra else []
+    for name in IGNORE_FILES:
+        if name not in present:
+            continue
+        try:
+            with open(f"{dir_path}/{name}", encoding="utf-8", errors="ignore") as f:
+                chunks.append(f.read())
+        except OSError:
+            continue
+    if not chunks:
+        return None
+    rules = compile_rules("\n".join(chunks))
+    return rules or None
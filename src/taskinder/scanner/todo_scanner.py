@@ -1,25 +1,37 @@
-import re
+import hashlib
+import mmap
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import chain, islice
 from pathlib import Path
-from typing import List
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
 
-TODO_PATTERN = re.compile(
-    r"(?:#|//|/\*|--|\*|<!--)\s*(TODO|FIXME|HACK|XXX|NOTE)\b\s*:?\s*(.+?)(?:\*/|-->)?\s*$",
-    re.MULTILINE,
+from taskinder.scanner.config import (
+    DEFAULT_CONFIG,
+    ScannerConfig,
+    load_config,
 )
+from taskinder.scanner.ignore import IGNORE_FILES, IgnoreRules, load_rules
+
+if TYPE_CHECKING:
+    from taskinder.storage.todo_index import FileState, TodoIndex
 
-EXTENSIONS = frozenset({
-    ".py", ".js", ".ts", ".tsx", ".jsx", ".go", ".rs",
-    ".c", ".cpp", ".h", ".hpp", ".java", ".kt", ".swift",
-    ".rb", ".php", ".cs", ".lua", ".sh", ".bash", ".zsh",
-    ".fish", ".r", ".scala", ".vue", ".svelte", ".html",
-    ".css", ".scss", ".sass", ".toml", ".yaml", ".yml",
-})
+# Files handed to a worker at a time; large enough to amortise scheduling,
+# small enough to keep every worker busy near the end of a scan.
+CHUNK_SIZE = 64
 
-IGNORE_DIRS = frozenset({
-    ".git", "__pycache__", "node_modules", ".venv", "venv",
-    "dist", "build", ".taskinder", ".tox", "target",
-})
+# Files at least this large are memory-mapped instead of read into memory.
+MMAP_THRESHOLD = 1 << 20
 
 
 @dataclass
@@ -28,38 +40,429 @@ class TodoItem:
     line: int
     kind: str
     text: str
+    fingerprint: str = ""
+
+    def task_fields(self) -> tuple[str, str, str]:
+        """``(fingerprint, title, description)`` for a task imported from this item."""
+        return (
+            self.fingerprint,
+            f"{self.kind}: {self.text}",
+            f"From {self.file}:{self.line}",
+        )
+
+
+class FileScan(NamedTuple):
+    """One scanned file: the stat it was read at, its content hash and items."""
+
+    path: str
+    mtime_ns: int
+    size: int
+    hash: str
+    items: List[TodoItem]
+
+
+def assign_fingerprints(items: List[TodoItem]) -> List[TodoItem]:
+    """Fingerprint the items of one file, given in line order.
+
+    The fingerprint hashes the file, kind and whitespace- and case-normalised
+    text, so it survives the comment moving within the file. Repeats of the
+    same comment in a file are told apart by their order.
+    """
+    seen: dict[tuple[str, str], int] = {}
+    for item in items:
+        key = (item.kind, " ".join(item.text.split()).casefold())
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        source = f"{item.file}\0{key[0]}\0{key[1]}\0{occurrence}"
+        item.fingerprint = hashlib.blake2b(source.encode(), digest_size=10).hexdigest()
+    return items
+
+
+def scan_content(
+    content: bytes | mmap.mmap, rel: str, config: ScannerConfig = DEFAULT_CONFIG
+) -> List[TodoItem]:
+    """Extract items from a file's raw bytes; ``rel`` is the reported path.
+
+    Files containing NUL bytes are treated as binary and skipped. Markers
+    are first located in the raw bytes with ``bytes.find`` (several times
+    faster than a regex over the whole buffer), and only the lines around
+    those hits are decoded and matched against the file's comment pattern.
+    """
+    if content.find(b"\0") != -1:
+        return []
+    pattern = config.pattern_for(rel)
+    items: List[TodoItem] = []
+    line_no, line_start, next_line = 1, 0, 0
+    for offset in _marker_offsets(content, config.marker_bytes):
+        if offset < next_line:
+            continue
+        start = content.rfind(b"\n", 0, offset) + 1
+        end = content.find(b"\n", offset)
+        if end == -1:
+            end = len(content)
+        next_line = end + 1
+        line_no += _count_newlines(content, line_start, start)
+        line_start = start
+        line = content[start:end].decode("utf-8", errors="ignore")
+        m = pattern.search(line)
+        if m:
+            items.append(
+                TodoItem(
+                    file=rel,
+                    line=line_no,
+                    kind=m.group(1).upper(),
+                    text=m.group(2).strip(),
+                )
+            )
+    return assign_fingerprints(items)
+
+
+def _marker_offsets(
+    content: bytes | mmap.mmap, markers: tuple[bytes, ...]
+) -> List[int]:
+    offsets: List[int] = []
+    for marker in markers:
+        i = content.find(marker)
+        while i != -1:
+            offsets.append(i)
+            i = content.find(marker, i + len(marker))
+    offsets.sort()
+    return offsets
+
+
+def _count_newlines(content: bytes | mmap.mmap, start: int, end: int) -> int:
+    if isinstance(content, bytes):
+        return content.count(b"\n", start, end)
+    return content[start:end].count(b"\n")
+
+
+def scan_file(
+    path: str,
+    rel: str,
+    mtime_ns: int = 0,
+    size: int = 0,
+    config: ScannerConfig = DEFAULT_CONFIG,
+) -> FileScan:
+    """Read and scan one file. Unreadable files come back empty, with no hash."""
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+                return _scan_buffer(f.read(), rel, mtime_ns, size, config)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _scan_buffer(mm, rel, mtime_ns, size, config)
+    except (OSError, ValueError):
+        return FileScan(rel, mtime_ns, size, "", [])
+
+
+def _scan_buffer(
+    content: bytes | mmap.mmap,
+    rel: str,
+    mtime_ns: int,
+    size: int,
+    config: ScannerConfig,
+) -> FileScan:
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+    return FileScan(rel, mtime_ns, size, digest, scan_content(content, rel, config))
+
+
+def _never() -> bool:
+    return False
+
+
+def _chunked(files: Iterable[tuple[str, str, int, int]], size: int) -> Iterator[List]:
+    it = iter(files)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _scan_chunk(
+    files: List[tuple[str, str, int, int]], config: ScannerConfig
+) -> List[FileScan]:
+    # Module-level so process pools can pickle it.
+    return [scan_file(*file, config=config) for file in files]
 
 
 class TodoScanner:
+    """Finds TODO-style comments under a project directory.
+
+    Files are scanned in chunks across ``jobs`` workers: threads by default,
+    which overlap file reads, or processes with ``processes=True`` for
+    regex-heavy trees where matching is the bottleneck. ``jobs=1`` scans
+    inline without a pool.
+
+    With an ``index``, results persist between scans and only files whose
+    size or mtime changed since the last scan are read again.
+
+    ``.gitignore``, ``.ignore`` and ``.taskinderignore`` files (plus
+    ``.git/info/exclude`` at the root) are honoured unless
+    ``ignore_files=False``; the configured ``ignore_dirs`` are always pruned.
+
+    Markers, extensions, ignored directories and comment syntaxes come from
+    the project's ``.taskinder/config.json`` (see ``load_config``) unless a
+    ``config`` is given.
+    """
+
+    def __init__(
+        self,
+        jobs: Optional[int] = None,
+        processes: bool = False,
+        index: Optional["TodoIndex"] = None,
+        ignore_files: bool = True,
+        config: Optional[ScannerConfig] = None,
+    ) -> None:
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        self.processes = processes
+        self.index = index
+        self.ignore_files = ignore_files
+        self.config = config
+
+    def config_for(self, root: Path) -> ScannerConfig:
+        return self.config or load_config(root)
+
     def scan(self, root: Path) -> List[TodoItem]:
-        items: List[TodoItem] = []
-        for path in self._walk(root):
-            items.extend(self._scan_file(path, root))
-        return sorted(items, key=lambda x: (x.file, x.line))
-
-    def _walk(self, root: Path):
-        for p in root.rglob("*"):
-            if not p.is_file():
+        """All items under ``root``, ordered by (file, line)."""
+        return sorted(self.iter_scan(root), key=lambda x: (x.file, x.line))
+
+    def iter_scan(
+        self, root: Path, should_stop: Optional[Callable[[], bool]] = None
+    ) -> Iterator[TodoItem]:
+        """Yield items as files are scanned, in (file, line) order.
+
+        Walking and scanning overlap, so the first items arrive long before
+        a large tree has been listed. Closing the iterator early stops the
+        scan; with an ``index``, the files scanned so far are still recorded.
+        ``should_stop`` is polled for every directory and file walked, so a
+        scan can also be stopped between items, e.g. from another thread.
+        """
+        config = self.config_for(root)
+        if self.index is not None:
+            return self._iter_incremental(root, config, should_stop)
+        files = (
+            (entry.path, rel, 0, 0)
+            for entry, rel in self._walk(root, config, should_stop=should_stop)
+        )
+        scans = self._scan_files(files, config, should_stop)
+        return (item for scan in scans for item in scan.items)
+
+    def refresh(self, root: Path, dirs: Optional[List[str]] = None) -> bool:
+        """Bring the index up to date without collecting items.
+
+        Returns whether any file was re-read or forgotten. The directories
+        walked are appended to ``dirs`` when given.
+        """
+        config = self.config_for(root)
+        self.index.use_config(config.digest)
+        states = self.index.file_states()
+        seen: set[str] = set()
+        stale = self._stale_files(root, config, states, seen, dirs=dirs)
+        scans = list(self._scan_files(stale, config))
+        removed = states.keys() - seen
+        if not scans and not removed:
+            return False
+        self.index.apply(scans, removed)
+        return True
+
+    def _iter_incremental(
+        self,
+        root: Path,
+        config: ScannerConfig,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[TodoItem]:
+        self.index.use_config(config.digest)
+        states = self.index.file_states()
+        cached = self.index.items_by_path()
+        seen: set[str] = set()
+        # Items of unchanged files, handed out as the scans catch up with
+        # them; the walk runs ahead of the scans.
+        unchanged: deque[TodoItem] = deque()
+        walked = False
+
+        def stale_files() -> Iterator[tuple[str, str, int, int]]:
+            nonlocal walked
+            yield from self._stale_files(
+                root,
+                config,
+                states,
+                seen,
+                lambda rel: unchanged.extend(cached.get(rel, ())),
+                should_stop=should_stop,
+            )
+            walked = should_stop is None or not should_stop()
+
+        scans: List[FileScan] = []
+        try:
+            for scan in self._scan_files(stale_files(), config, should_stop):
+                scans.append(scan)
+                while unchanged and unchanged[0].file < scan.path:
+                    yield unchanged.popleft()
+                yield from scan.items
+            if walked:
+                yield from unchanged
+        finally:
+            # Only a finished walk proves that a file is gone.
+            removed = states.keys() - seen if walked else set()
+            if scans or removed:
+                self.index.apply(scans, removed)
+
+    def _stale_files(
+        self,
+        root: Path,
+        config: ScannerConfig,
+        states: dict[str, "FileState"],
+        seen: set[str],
+        on_unchanged: Optional[Callable[[str], None]] = None,
+        dirs: Optional[List[str]] = None,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[tuple[str, str, int, int]]:
+        """Walk ``root``, yielding files whose stat differs from ``states``."""
+        for entry, rel in self._walk(root, config, dirs, should_stop):
+            seen.add(rel)
+            try:
+                st = entry.stat()
+            except OSError:
                 continue
-            if p.suffix not in EXTENSIONS:
+            state = states.get(rel)
+            if (
+                state is None
+                or state.mtime_ns != st.st_mtime_ns
+                or state.size != st.st_size
+            ):
+                yield entry.path, rel, st.st_mtime_ns, st.st_size
+            elif on_unchanged is not None:
+                on_unchanged(rel)
+
+    def _scan_files(
+        self,
+        files: Iterable[tuple[str, str, int, int]],
+        config: ScannerConfig,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[FileScan]:
+        stop = should_stop or _never
+        chunks = _chunked(files, CHUNK_SIZE)
+        if self.jobs == 1:
+            for chunk in chunks:
+                if stop():
+                    return
+                yield from _scan_chunk(chunk, config)
+            return
+        first = next(chunks, None)
+        second = next(chunks, None)
+        if second is None:
+            if first is not None:
+                yield from _scan_chunk(first, config)
+            return
+        # Keep a bounded number of chunks in flight so the walk is consumed
+        # lazily and results come back in submission order.
+        pending: deque[Future[List[FileScan]]] = deque()
+        with self._executor(self.jobs) as pool:
+            try:
+                for chunk in chain((first, second), chunks):
+                    if stop():
+                        return
+                    pending.append(pool.submit(_scan_chunk, chunk, config))
+                    if len(pending) >= 2 * self.jobs:
+                        yield from pending.popleft().result()
+                while pending and not stop():
+                    yield from pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _executor(self, workers: int) -> Executor:
+        if self.processes:
+            return ProcessPoolExecutor(max_workers=workers)
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="todo-scan")
+
+    def _walk(
+        self,
+        root: Path,
+        config: Optional[ScannerConfig] = None,
+        dirs: Optional[List[str]] = None,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[tuple[os.DirEntry, str]]:
+        """Yield ``(entry, relative path)`` for every scannable file under ``root``.
+
+        Ignored directories are pruned before descending, file types come
+        from the cached ``DirEntry`` data, and symlinked directories are not
+        followed, so each directory is listed exactly once. Each directory
+        carries the ignore rules of its ancestors; deeper files take
+        precedence, as in git. Files come in lexical order of their relative
+        paths. Listed directory paths are appended to ``dirs`` when given.
+        The walk ends early once ``should_stop`` returns true.
+        """
+        stop = should_stop or _never
+        config = config or self.config_for(root)
+        extensions, ignore_dirs = config.extensions, config.ignore_dirs
+        root_path = os.fspath(root)
+        exclude = self._read_exclude(root_path) if self.ignore_files else ""
+        # Directories to list and files to yield share one stack, pushed in
+        # reverse so they pop in lexical order of their relative paths.
+        stack: List[tuple[str, str, tuple, Optional[os.DirEntry]]] = [
+            (root_path, "", (), None)
+        ]
+        while stack:
+            if stop():
+                return
+            dir_path, rel_dir, rules, file = stack.pop()
+            if file is not None:
+                yield file, rel_dir
                 continue
-            if any(part in IGNORE_DIRS for part in p.parts):
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
                 continue
-            yield p
+            if dirs is not None:
+                dirs.append(dir_path)
+            if self.ignore_files:
+                names = [e.name for e in entries if e.name in IGNORE_FILES]
+                local = load_rules(dir_path, names, exclude if not rel_dir else "")
+                if local is not None:
+                    rules = ((len(rel_dir), local),) + rules
+            children: List[tuple[str, str, tuple, Optional[os.DirEntry]]] = []
+            for entry in entries:
+                name = entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if name in ignore_dirs:
+                            continue
+                        rel = rel_dir + name
+                        if rules and _ignored(rules, rel, True):
+                            continue
+                        children.append((entry.path, rel + "/", rules, None))
+                        continue
+                    dot = name.rfind(".")
+                    if dot <= 0 or name[dot:] not in extensions:
+                        continue
+                    rel = rel_dir + name
+                    if rules and _ignored(rules, rel, False):
+                        continue
+                    if entry.is_file():
+                        children.append(("", rel, (), entry))
+                except OSError:
+                    continue
+            # Directory paths end in "/", so this is the order of the paths
+            # below them too.
+            children.sort(key=lambda child: child[1], reverse=True)
+            stack.extend(children)
 
-    def _scan_file(self, path: Path, root: Path) -> List[TodoItem]:
-        items: List[TodoItem] = []
+    @staticmethod
+    def _read_exclude(root: str) -> str:
         try:
-            content = path.read_text(encoding="utf-8", errors="ignore")
-            for i, line in enumerate(content.splitlines(), 1):
-                m = TODO_PATTERN.search(line)
-                if m:
-                    items.append(TodoItem(
-                        file=str(path.relative_to(root)),
-                        line=i,
-                        kind=m.group(1).upper(),
-                        text=m.group(2).strip(),
-                    ))
-        except (OSError, PermissionError):
-            pass
-        return items
+            with open(
+                os.path.join(root, ".git", "info", "exclude"), encoding="utf-8"
+            ) as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return ""
+
+
+def _ignored(
+    rules: tuple[tuple[int, IgnoreRules], ...], rel: str, is_dir: bool
+) -> bool:
+    # ``rules`` runs deepest first; the first directory with an opinion wins.
+    for offset, local in rules:
+        verdict = local.match(rel[offset:], is_dir)
+        if verdict is not None:
+            return verdict
+    return False
@@ -0,0 +1,270 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+from taskinder.scanner.config import CONFIG_FILE, DEFAULT_CONFIG
+from taskinder.scanner.ignore import IGNORE_FILES
+from taskinder.scanner.todo_scanner import TodoScanner
+
+# Quiet period that ends a burst of changes (branch switch, formatter run).
+DEFAULT_DEBOUNCE = 0.3
+# Seconds between tree snapshots when inotify is unavailable.
+DEFAULT_POLL_INTERVAL = 1.0
+
+# inotify constants from <sys/inotify.h>.
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_ONLYDIR
+)
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal inotify binding over ctypes; raises ``OSError`` if unavailable."""
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        # Both ways between watched directories and watch descriptors, so a
+        # watch the kernel drops can be re-added when its path comes back.
+        self._watched: dict[str, int] = {}
+        self._paths: dict[int, str] = {}
+
+    def watch(self, paths: List[str]) -> None:
+        for path in paths:
+            if path in self._watched:
+                continue
+            wd = self._add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                    continue
+                raise OSError(err, os.strerror(err), path)
+            self._watched[path] = wd
+            self._paths[wd] = path
+
+    def read(self, timeout: float) -> Iterator[tuple[int, str]]:
+        """Yield ``(mask, name)`` for events arriving within ``timeout`` seconds."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & _IN_IGNORED:
+                # The kernel dropped this watch (directory deleted or
+                # unmounted); forget it so a directory recreated at the
+                # same path is watched again.
+                path = self._paths.pop(wd, None)
+                if path is not None and self._watched.get(path) == wd:
+                    del self._watched[path]
+            elif mask & _IN_ISDIR and mask & (_IN_DELETE | _IN_MOVED_FROM):
+                parent = self._paths.get(wd)
+                if parent is not None:
+                    self._drop_tree(os.path.join(parent, name))
+            yield mask, name
+
+    def _drop_tree(self, path: str) -> None:
+        # A directory moved away keeps its watches, now under another path;
+        # forget the old paths so whatever appears there is watched afresh.
+        prefix = path + os.sep
+        for watched in [p for p in self._watched if p == path or p.startswith(prefix)]:
+            del self._watched[watched]
+
+    def forget(self) -> None:
+        # Watches of deleted directories vanish on their own; re-adding is
+        # harmless, so the path cache is simply rebuilt on the next refresh.
+        self._watched.clear()
+        self._paths.clear()
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _relevant(mask: int, name: str, extensions: frozenset[str]) -> bool:
+    if mask & (_IN_Q_OVERFLOW | _IN_ISDIR):
+        return True
+    if name in IGNORE_FILES or name == CONFIG_FILE.name:
+        return True
+    dot = name.rfind(".")
+    return dot > 0 and name[dot:] in extensions
+
+
+class TodoWatcher:
+    """Keeps a scanner's index in step with a project tree.
+
+    Uses inotify where available and otherwise polls, comparing a stat
+    snapshot taken with the scanner's own walker. Changes are collected
+    until the tree has been quiet for ``debounce`` seconds; then only the
+    files that changed are re-read into the index.
+    """
+
+    def __init__(
+        self,
+        scanner: TodoScanner,
+        root: Path,
+        debounce: float = DEFAULT_DEBOUNCE,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        polling: bool = False,
+    ) -> None:
+        if scanner.index is None:
+            raise ValueError("Watching needs a scanner with an index.")
+        self.scanner = scanner
+        self.root = root
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._inotify: Optional[_Inotify] = None
+        if not polling:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                self._inotify = None
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def run(
+        self,
+        on_change: Callable[[], None],
+        stop: threading.Event,
+        on_error: Optional[Callable[[ValueError], None]] = None,
+    ) -> None:
+        """Refresh the index now and after every burst of changes until
+        ``stop`` is set. ``on_change`` runs whenever the index changed.
+
+        An invalid project config is passed to ``on_error`` (or raised when
+        there is none); watching continues so a fixed config is picked up.
+        """
+        try:
+            if self._refresh(on_error):
+                on_change()
+            while not stop.is_set():
+                if self._wait(stop) and self._refresh(on_error):
+                    on_change()
+        finally:
+            if self._inotify is not None:
+                self._inotify.close()
+
+    def _refresh(self, on_error: Optional[Callable[[ValueError], None]]) -> bool:
+        dirs: List[str] = []
+        try:
+            changed = self.scanner.refresh(self.root, dirs)
+        except ValueError as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            changed = False
+        # The config lives in the (pruned) .taskinder directory; events for
+        # the database next to it are filtered out by name.
+        config_dir = self.root / CONFIG_FILE.parent
+        if config_dir.is_dir():
+            dirs.append(os.fspath(config_dir))
+        if self._inotify is not None:
+            try:
+                self._inotify.watch(dirs)
+            except OSError:
+                # Usually the inotify watch limit; fall back to polling.
+                self._inotify.close()
+                self._inotify = None
+        return changed
+
+    def _wait(self, stop: threading.Event) -> bool:
+        if self._inotify is None:
+            return self._wait_polling(stop)
+        return self._wait_inotify(stop)
+
+    def _wait_inotify(self, stop: threading.Event) -> bool:
+        inotify = self._inotify
+        try:
+            extensions = self.scanner.config_for(self.root).extensions
+        except ValueError:
+            extensions = DEFAULT_CONFIG.extensions
+        started = None
+        while not stop.is_set():
+            events = list(inotify.read(self.debounce if started else 0.5))
+            if any(mask & _IN_Q_OVERFLOW for mask, _ in events):
+                inotify.forget()
+            if any(_relevant(mask, name, extensions) for mask, name in events):
+                started = started or time.monotonic()
+                # Keep extending the quiet period, but don't starve a tree
+                # that never settles.
+                if time.monotonic() - started < 10 * self.debounce:
+                    continue
+            if started is not None:
+                return True
+        return False
+
+    def _wait_polling(self, stop: threading.Event) -> bool:
+        before = self._snapshot()
+        while not stop.wait(self.poll_interval):
+            after = self._snapshot()
+            if after == before:
+                continue
+            # Wait for the burst to settle before reporting it.
+            while not stop.wait(self.debounce):
+                settled = self._snapshot()
+                if settled == after:
+                    return True
+                after = settled
+        return False
+
+    def _snapshot(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        try:
+            st = (self.root / CONFIG_FILE).stat()
+            snapshot[str(CONFIG_FILE)] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        try:
+            config = self.scanner.config_for(self.root)
+        except ValueError:
+            config = DEFAULT_CONFIG
+        for entry, rel in self.scanner._walk(self.root, config):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            snapshot[rel] = (st.st_mtime_ns, st.st_size)
+        return snapshot
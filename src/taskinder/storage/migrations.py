@@ -0,0 +1,237 @@
+import sqlite3
+from typing import Callable, Sequence, Union
+
+
+def _create_task_search(conn: sqlite3.Connection) -> None:
+    """Full-text index over task titles and descriptions, kept in sync by triggers.
+
+    Skipped when SQLite was built without FTS5; search then falls back to
+    ``LIKE`` matching.
+    """
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE tasks_fts USING fts5(
+                title, description,
+                content='tasks', content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        if "fts5" in str(e):
+            return
+        raise
+    conn.execute("""
+        CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, title, description)
+            VALUES (new.rowid, new.title, new.description);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+            VALUES ('delete', old.rowid, old.title, old.description);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+            VALUES ('delete', old.rowid, old.title, old.description);
+            INSERT INTO tasks_fts (rowid, title, description)
+            VALUES (new.rowid, new.title, new.description);
+        END
+    """)
+    conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+
+# Change log entries kept for readers catching up; older ones are pruned.
+CHANGE_LOG_SIZE = 10_000
+
+
+def _create_change_log(conn: sqlite3.Connection) -> None:
+    """Log of task writes, one ``(seq, task_id, op)`` row each, filled by triggers.
+
+    Lets another connection (a TUI in the next pane) ask for just the tasks
+    written since the last change it saw. ``seq`` is AUTOINCREMENT so it
+    never goes back. At least the newest ``CHANGE_LOG_SIZE`` entries are
+    kept, older ones are pruned a thousand at a time; a reader further
+    behind than that reloads everything.
+    """
+    conn.execute("""
+        CREATE TABLE task_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id TEXT NOT NULL,
+            op TEXT NOT NULL
+        ) STRICT
+    """)
+    for event, op, row in (
+        ("INSERT", "I", "new"),
+        ("UPDATE", "U", "new"),
+        ("DELETE", "D", "old"),
+    ):
+        conn.execute(f"""
+            CREATE TRIGGER tasks_log_{event.lower()} AFTER {event} ON tasks BEGIN
+                INSERT INTO task_changes (task_id, op) VALUES ({row}.id, '{op}');
+            END
+        """)
+    conn.execute(f"""
+        CREATE TRIGGER task_changes_prune AFTER INSERT ON task_changes
+        WHEN new.seq % 1000 = 0 BEGIN
+            DELETE FROM task_changes WHERE seq <= new.seq - {CHANGE_LOG_SIZE};
+        END
+    """)
+
+
+def _compact_tasks(conn: sqlite3.Connection) -> None:
+    """Rebuild ``tasks`` as a STRICT table with integer status codes.
+
+    Timestamps stay ISO-8601 text: ``datetime.fromisoformat`` is the cheapest
+    way to rebuild a ``datetime`` in Python. ``seq`` aliases the rowid so the
+    FTS index keeps a stable key (a plain rowid may be renumbered by VACUUM),
+    and the table stays a rowid table, since WITHOUT ROWID suits small rows,
+    not free-form descriptions.
+    """
+    conn.execute("""
+        CREATE TABLE tasks_compact (
+            seq INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '',
+            status INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        ) STRICT
+    """)
+    conn.execute("""
+        INSERT INTO tasks_compact
+            (id, title, description, status, created_at, updated_at)
+        SELECT id, title, coalesce(description, ''),
+               CASE status WHEN 'DOING' THEN 1 WHEN 'DONE' THEN 2 ELSE 0 END,
+               created_at, updated_at
+        FROM tasks ORDER BY rowid
+    """)
+    conn.execute("DROP TABLE IF EXISTS tasks_fts")
+    conn.execute("DROP TABLE tasks")
+    conn.execute("ALTER TABLE tasks_compact RENAME TO tasks")
+    for statement in MIGRATIONS[1]:
+        conn.execute(statement)
+    _create_task_search(conn)
+
+
+# Each migration is either a sequence of SQL statements or a callable that
+# receives the connection. Migration N brings the schema to user_version N;
+# append new entries, never edit or reorder existing ones.
+Migration = Union[Sequence[str], Callable[[sqlite3.Connection], None]]
+
+MIGRATIONS: list[Migration] = [
+    # 1 — base schema
+    (
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT DEFAULT '',
+            status TEXT DEFAULT 'TODO',
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """,
+    ),
+    # 2 — secondary indexes for status filters, ordering and title lookups
+    (
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_created"
+        " ON tasks (status, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_updated ON tasks (updated_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_title ON tasks (title)",
+    ),
+    # 3 — FTS5 search index
+    _create_task_search,
+    # 4 — compact STRICT encoding with integer status codes
+    _compact_tasks,
+    # 5 — incremental TODO scan index: per-file stat/hash and extracted items
+    (
+        """
+        CREATE TABLE scan_files (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            hash TEXT NOT NULL
+        ) STRICT, WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE todos (
+            path TEXT NOT NULL,
+            line INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            text TEXT NOT NULL,
+            PRIMARY KEY (path, line)
+        ) STRICT, WITHOUT ROWID
+        """,
+    ),
+    # 6 — link tasks imported from TODO comments back to their source
+    (
+        "ALTER TABLE tasks ADD COLUMN fingerprint TEXT",
+        "CREATE UNIQUE INDEX idx_tasks_fingerprint ON tasks (fingerprint)"
+        " WHERE fingerprint IS NOT NULL",
+    ),
+    # 7 — filter indexed TODOs by kind (paths are already the primary key)
+    ("CREATE INDEX idx_todos_kind ON todos (kind)",),
+    # 8 — scan index metadata, e.g. the scanner config the results came from
+    (
+        """
+        CREATE TABLE scan_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        ) STRICT, WITHOUT ROWID
+        """,
+    ),
+    # 9 — trigger-fed log of task writes, for cheap external change detection
+    _create_change_log,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+# STRICT tables need 3.37; RETURNING, used by the task repository, 3.35.
+MIN_SQLITE_VERSION = (3, 37, 0)
+
+
+def _user_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Upgrade the database in place to ``SCHEMA_VERSION``.
+
+    Every migration runs in its own ``BEGIN IMMEDIATE`` transaction, and the
+    version is re-checked once the write lock is held, so concurrent
+    processes opening the same database apply each step exactly once.
+    """
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+        raise RuntimeError(
+            f"Taskinder needs SQLite {'.'.join(map(str, MIN_SQLITE_VERSION))} "
+            f"or newer; Python is linked against SQLite {sqlite3.sqlite_version}."
+        )
+    version = _user_version(conn)
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {version} is newer than this "
+            f"Taskinder supports ({SCHEMA_VERSION})."
+        )
+    for number in range(version + 1, SCHEMA_VERSION + 1):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if _user_version(conn) < number:
+                migration = MIGRATIONS[number - 1]
+                if callable(migration):
+                    migration(conn)
+                else:
+                    for statement in migration:
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return _user_version(conn)
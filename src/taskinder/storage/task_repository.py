@@ -1,100 +1,502 @@
-import sqlite3
+import re
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Mapping, NamedTuple, Optional
 
-from taskinder.models.task import Task, TaskStatus
+from taskinder.models.task import (
+    PREVIEW_LENGTH,
+    STATUS_BY_CODE,
+    STATUS_CODES,
+    Task,
+    TaskStatus,
+    TaskSummary,
+)
+from taskinder.storage.database import Database
+
+DEFAULT_BATCH_SIZE = 500
+
+# Column order expected by ``Task.from_row`` / produced by ``Task.to_row``.
+TASK_COLUMNS = "id, title, description, status, created_at, updated_at"
+_SELECT_TASKS = f"SELECT {TASK_COLUMNS} FROM tasks"
+_INSERT_TASK = f"INSERT INTO tasks ({TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+# Tasks linked to a source comment; an already linked fingerprint is skipped.
+_INSERT_FINGERPRINTED = (
+    f"INSERT INTO tasks ({TASK_COLUMNS}, fingerprint) VALUES (?, ?, ?, ?, ?, ?, ?)"
+    " ON CONFLICT (fingerprint) WHERE fingerprint IS NOT NULL DO NOTHING"
+)
+
+SUMMARY_COLUMNS = (
+    "id, title, status, updated_at, "
+    f"substr(description, 1, {PREVIEW_LENGTH + 1}), created_at"
+)
+
+# Sort keys accepted by ``query``; prefix with "-" for descending order.
+ORDER_COLUMNS = {
+    "created": "created_at",
+    "updated": "updated_at",
+    "title": "title",
+}
+
+
+_SEARCH_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def _fts_query(text: str) -> str:
+    """Turn user input into an FTS5 query.
+
+    Quoted input is kept as an exact phrase, every other word is matched as a
+    prefix, and all terms must match.
+    """
+    terms = []
+    for phrase, word in _SEARCH_TERM.findall(text):
+        if phrase.strip():
+            terms.append('"' + phrase.replace('"', '""') + '"')
+        elif word:
+            terms.append('"' + word.replace('"', '""') + '"*')
+    return " ".join(terms)
+
+
+def _like_pattern(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class SyncResult(NamedTuple):
+    added: int
+    updated: int
+    resolved: int
+
+
+class TaskChanges(NamedTuple):
+    seq: int  # newest change included
+    updated: List[TaskSummary]  # tasks added or changed, as they are now
+    deleted: List[str]  # ids of tasks that are gone
 
 
 class TaskRepository:
-    def __init__(self, db_path: Path | str) -> None:
-        self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+    """SQLite-backed task storage.
+
+    Reuses the per-thread connections of its ``Database``. Pass a path to
+    open a database owned by the repository, or share an existing one.
+    Call ``close()`` (or use the repository as a context manager) when done.
+    """
+
+    def __init__(self, db_path: Path | str | Database) -> None:
+        self.database = db_path if isinstance(db_path, Database) else Database(db_path)
+        self.db_path = self.database.path
+        self._connect = self.database.connect
         self._init_db()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        return conn
+    def __enter__(self) -> "TaskRepository":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying database connections."""
+        self.database.close()
 
     def _init_db(self) -> None:
-        with self._connect() as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS tasks (
-                    id TEXT PRIMARY KEY,
-                    title TEXT NOT NULL,
-                    description TEXT DEFAULT '',
-                    status TEXT DEFAULT 'TODO',
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
-            conn.commit()
+        conn = self._connect()
+        self._has_fts = (
+            conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'"
+            ).fetchone()
+            is not None
+        )
 
-    def _row_to_task(self, row: sqlite3.Row) -> Task:
-        return Task.from_dict(dict(row))
+    def _iter_rows(
+        self, sql: str, params: Iterable = (), batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[tuple]:
+        cursor = self._connect().execute(sql, tuple(params))
+        try:
+            while rows := cursor.fetchmany(batch_size):
+                yield from rows
+        finally:
+            cursor.close()
 
     def get_all(self) -> List[Task]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT * FROM tasks ORDER BY created_at DESC"
-            ).fetchall()
-        return [self._row_to_task(row) for row in rows]
+        return list(self.iter_tasks())
+
+    def iter_tasks(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Task]:
+        """Yield every task, newest first, reading ``batch_size`` rows at a time."""
+        rows = self._iter_rows(
+            f"{_SELECT_TASKS} ORDER BY created_at DESC", batch_size=batch_size
+        )
+        return map(Task.from_row, rows)
 
     def add(self, task: Task) -> None:
-        d = task.to_dict()
         with self._connect() as conn:
-            conn.execute(
-                "INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?)",
-                (d["id"], d["title"], d["description"], d["status"],
-                 d["created_at"], d["updated_at"]),
+            conn.execute(_INSERT_TASK, task.to_row())
+
+    def add_fingerprinted(self, tasks: Iterable[tuple[str, Task]]) -> int:
+        """Insert ``(fingerprint, task)`` pairs, skipping fingerprints already
+        linked to a task. Returns how many were added."""
+        with self._connect() as conn:
+            result = conn.executemany(
+                _INSERT_FINGERPRINTED,
+                ((*task.to_row(), fingerprint) for fingerprint, task in tasks),
             )
-            conn.commit()
+        return result.rowcount
 
-    def find_by_id(self, task_id: str) -> Optional[Task]:
+    def sync_fingerprinted(self, tasks: Mapping[str, Task]) -> SyncResult:
+        """Make the fingerprinted tasks match ``tasks``, in one transaction.
+
+        Fingerprints not seen before are inserted, known ones get their title
+        and description refreshed if they changed, and open tasks whose
+        fingerprint is missing from ``tasks`` are marked done.
+        """
+        now = datetime.now().isoformat()
+        done = STATUS_CODES[TaskStatus.DONE]
         with self._connect() as conn:
-            row = conn.execute(
-                "SELECT * FROM tasks WHERE id = ?", (task_id,)
-            ).fetchone()
-        return self._row_to_task(row) if row else None
+            existing = {
+                fingerprint: row
+                for fingerprint, *row in conn.execute(
+                    "SELECT fingerprint, id, title, description, status FROM tasks"
+                    " WHERE fingerprint IS NOT NULL"
+                )
+            }
+            added = [
+                (*task.to_row(), fingerprint)
+                for fingerprint, task in tasks.items()
+                if fingerprint not in existing
+            ]
+            updated = []
+            resolved = []
+            for fingerprint, (task_id, title, description, status) in existing.items():
+                task = tasks.get(fingerprint)
+                if task is None:
+                    if status != done:
+                        resolved.append((done, now, task_id))
+                elif (task.title, task.description) != (title, description):
+                    updated.append((task.title, task.description, now, task_id))
+            conn.executemany(_INSERT_FINGERPRINTED, added)
+            conn.executemany(
+                "UPDATE tasks SET title = ?, description = ?, updated_at = ?"
+                " WHERE id = ?",
+                updated,
+            )
+            conn.executemany(
+                "UPDATE tasks SET status = ?, updated_at = ? WHERE id = ?", resolved
+            )
+        return SyncResult(len(added), len(updated), len(resolved))
+
+    def find_by_id(self, task_id: str) -> Optional[Task]:
+        row = (
+            self._connect()
+            .execute(f"{_SELECT_TASKS} WHERE id = ?", (task_id,))
+            .fetchone()
+        )
+        return Task.from_row(row) if row else None
+
+    def find_by_id_prefix(self, prefix: str, limit: int = 2) -> List[Task]:
+        """Return up to ``limit`` tasks whose id starts with ``prefix``.
+
+        Uses a range seek on the primary key, so the default ``limit=2`` is
+        enough to tell a unique match from an ambiguous one.
+        """
+        if not prefix:
+            return []
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        rows = (
+            self._connect()
+            .execute(
+                f"{_SELECT_TASKS} WHERE id >= ? AND id < ? ORDER BY id LIMIT ?",
+                (prefix, upper, limit),
+            )
+            .fetchall()
+        )
+        return [Task.from_row(row) for row in rows]
+
+    def _build_query(
+        self,
+        select: str,
+        status: TaskStatus | Iterable[TaskStatus] | None = None,
+        text: Optional[str] = None,
+        created_since: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        order_by: str = "-created",
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> tuple[str, list]:
+        descending = order_by.startswith("-")
+        column = ORDER_COLUMNS.get(order_by.lstrip("-"))
+        if column is None:
+            raise ValueError(
+                f"Invalid sort key '{order_by}'. Use one of: {', '.join(ORDER_COLUMNS)}"
+            )
+
+        where: list[str] = []
+        params: list = []
+        if status is not None:
+            statuses = [status] if isinstance(status, TaskStatus) else list(status)
+            where.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(STATUS_CODES[s] for s in statuses)
+        if text:
+            pattern = _like_pattern(text)
+            where.append("(title LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')")
+            params.extend((pattern, pattern))
+        if created_since is not None:
+            where.append("created_at >= ?")
+            params.append(created_since.isoformat())
+        if updated_since is not None:
+            where.append("updated_at >= ?")
+            params.append(updated_since.isoformat())
+        if after is not None:
+            # Keyset pagination: continue strictly past the cursor row in sort order.
+            op = "<" if descending else ">"
+            where.append(
+                f"({column}, seq) {op} (SELECT {column}, seq FROM tasks WHERE id = ?)"
+            )
+            params.append(after)
+
+        sql = select
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        direction = "DESC" if descending else "ASC"
+        # Ties are broken on the rowid, which every index already ends with,
+        # so the sort is read straight off the index.
+        sql += f" ORDER BY {column} {direction}, seq {direction}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, params
+
+    def iter_query(
+        self,
+        status: TaskStatus | Iterable[TaskStatus] | None = None,
+        text: Optional[str] = None,
+        created_since: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        order_by: str = "-created",
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[Task]:
+        """Filter, sort and page tasks with a single parameterised statement.
+
+        Rows are read ``batch_size`` at a time. ``after`` is the id of the
+        last task of the previous page; results continue right after it in
+        ``order_by`` order.
+        """
+        sql, params = self._build_query(
+            _SELECT_TASKS,
+            status=status,
+            text=text,
+            created_since=created_since,
+            updated_since=updated_since,
+            order_by=order_by,
+            limit=limit,
+            after=after,
+        )
+        return map(Task.from_row, self._iter_rows(sql, params, batch_size))
+
+    def query(self, **filters) -> List[Task]:
+        """Like ``iter_query``, but returns a list."""
+        return list(self.iter_query(**filters))
+
+    def iter_summaries(
+        self, batch_size: int = DEFAULT_BATCH_SIZE, **filters
+    ) -> Iterator[TaskSummary]:
+        """Like ``iter_query``, but yields ``TaskSummary`` projections.
+
+        Only the columns list views need are read, and descriptions are cut
+        down to a preview inside SQLite.
+        """
+        sql, params = self._build_query(
+            f"SELECT {SUMMARY_COLUMNS} FROM tasks", **filters
+        )
+        return map(TaskSummary.from_row, self._iter_rows(sql, params, batch_size))
+
+    def query_summaries(self, **filters) -> List[TaskSummary]:
+        """Like ``iter_summaries``, but returns a list."""
+        return list(self.iter_summaries(**filters))
+
+    def _search_sql(
+        self,
+        columns: str,
+        match: str,
+        status: TaskStatus | Iterable[TaskStatus] | None,
+        limit: Optional[int],
+    ) -> tuple[str, list]:
+        sql = (
+            f"SELECT {columns} FROM tasks_fts JOIN tasks ON tasks.seq = tasks_fts.rowid"
+            " WHERE tasks_fts MATCH ?"
+        )
+        params: list = [match]
+        if status is not None:
+            statuses = [status] if isinstance(status, TaskStatus) else list(status)
+            sql += f" AND tasks.status IN ({', '.join('?' * len(statuses))})"
+            params.extend(STATUS_CODES[s] for s in statuses)
+        sql += " ORDER BY bm25(tasks_fts, 10.0, 1.0)"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, params
+
+    def search(
+        self,
+        text: str,
+        status: TaskStatus | Iterable[TaskStatus] | None = None,
+        limit: Optional[int] = 50,
+    ) -> List[Task]:
+        """Full-text search over titles and descriptions, best matches first.
+
+        Title hits rank above description hits. Without FTS5 this degrades
+        to a substring match ordered by recency.
+        """
+        match = _fts_query(text)
+        if not match:
+            return []
+        if not self._has_fts:
+            return self.query(status=status, text=text, limit=limit)
+        columns = ", ".join(f"tasks.{c}" for c in TASK_COLUMNS.split(", "))
+        sql, params = self._search_sql(columns, match, status, limit)
+        rows = self._connect().execute(sql, params).fetchall()
+        return [Task.from_row(row) for row in rows]
+
+    def search_summaries(
+        self,
+        text: str,
+        status: TaskStatus | Iterable[TaskStatus] | None = None,
+        limit: Optional[int] = 50,
+    ) -> List[TaskSummary]:
+        """Like ``search``, but returns ``TaskSummary`` projections."""
+        match = _fts_query(text)
+        if not match:
+            return []
+        if not self._has_fts:
+            return self.query_summaries(status=status, text=text, limit=limit)
+        columns = (
+            "tasks.id, tasks.title, tasks.status, tasks.updated_at,"
+            f" substr(tasks.description, 1, {PREVIEW_LENGTH + 1}), tasks.created_at"
+        )
+        sql, params = self._search_sql(columns, match, status, limit)
+        rows = self._connect().execute(sql, params).fetchall()
+        return [TaskSummary.from_row(row) for row in rows]
 
     def find_by_title(self, task_title: str) -> List[Task]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT * FROM tasks WHERE title = ?", (task_title,)
-            ).fetchall()
-        return [self._row_to_task(row) for row in rows]
+        rows = (
+            self._connect()
+            .execute(f"{_SELECT_TASKS} WHERE title = ?", (task_title,))
+            .fetchall()
+        )
+        return [Task.from_row(row) for row in rows]
 
     def find_by_status(self, status: TaskStatus) -> List[Task]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT * FROM tasks WHERE status = ?", (status.value,)
-            ).fetchall()
-        return [self._row_to_task(row) for row in rows]
+        rows = (
+            self._connect()
+            .execute(
+                f"{_SELECT_TASKS} WHERE status = ? ORDER BY created_at DESC",
+                (STATUS_CODES[status],),
+            )
+            .fetchall()
+        )
+        return [Task.from_row(row) for row in rows]
 
     def update(self, updated_task: Task) -> None:
-        d = updated_task.to_dict()
+        id_, title, description, status, _, updated_at = updated_task.to_row()
         with self._connect() as conn:
             result = conn.execute(
-                "UPDATE tasks SET title=?, description=?, status=?, updated_at=? WHERE id=?",
-                (d["title"], d["description"], d["status"], d["updated_at"], d["id"]),
+                "UPDATE tasks SET title=?, description=?, status=?, updated_at=?"
+                " WHERE id=?",
+                (title, description, status, updated_at, id_),
             )
-            conn.commit()
         if result.rowcount == 0:
             raise ValueError(f"Task '{updated_task.id}' not found.")
 
-    def delete(self, task_id: str) -> None:
+    def update_fields(
+        self,
+        task_id: str,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+    ) -> Optional[Task]:
+        """Apply a partial update in one statement and return the fresh task.
+
+        Only the given fields are written, ``updated_at`` is always bumped, and
+        ``None`` is returned when no task has the given id.
+        """
+        assignments = ["updated_at = ?"]
+        params: list = [datetime.now().isoformat()]
+        if title is not None:
+            assignments.append("title = ?")
+            params.append(title)
+        if description is not None:
+            assignments.append("description = ?")
+            params.append(description)
+        if status is not None:
+            assignments.append("status = ?")
+            params.append(STATUS_CODES[status])
+        params.append(task_id)
         with self._connect() as conn:
-            result = conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-            conn.commit()
-        if result.rowcount == 0:
+            row = conn.execute(
+                f"UPDATE tasks SET {', '.join(assignments)} WHERE id = ?"
+                f" RETURNING {TASK_COLUMNS}",
+                params,
+            ).fetchone()
+        return Task.from_row(row) if row else None
+
+    def delete(self, task_id: str) -> Task:
+        """Delete a task and return it as it was."""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"DELETE FROM tasks WHERE id = ? RETURNING {TASK_COLUMNS}", (task_id,)
+            ).fetchone()
+        if row is None:
             raise ValueError(f"Task '{task_id}' not found.")
+        return Task.from_row(row)
 
     def count(self) -> dict[str, int]:
         counts: dict[str, int] = {"TODO": 0, "DOING": 0, "DONE": 0}
-        with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT status, COUNT(*) as cnt FROM tasks GROUP BY status"
-            ).fetchall()
-        for row in rows:
-            counts[row["status"]] = row["cnt"]
+        rows = (
+            self._connect()
+            .execute("SELECT status, COUNT(*) as cnt FROM tasks GROUP BY status")
+            .fetchall()
+        )
+        for status, cnt in rows:
+            counts[STATUS_BY_CODE[status].value] = cnt
         return counts
+
+    def data_version(self) -> int:
+        """A number that moves whenever another connection commits.
+
+        Commits made on this thread's own connection leave it alone, which
+        makes it a cheap "did anyone else write?" check to poll.
+        """
+        return self._connect().execute("PRAGMA data_version").fetchone()[0]
+
+    def latest_change(self) -> int:
+        """Sequence number of the newest entry in the task change log."""
+        row = self._connect().execute("SELECT MAX(seq) FROM task_changes").fetchone()
+        return row[0] or 0
+
+    def changes_since(self, seq: int) -> Optional[TaskChanges]:
+        """Tasks written after change ``seq``, or None if the change log has
+        already been pruned past it and only a full reload will do."""
+        conn = self._connect()
+        first = conn.execute(
+            "SELECT MIN(seq), MAX(seq) FROM task_changes WHERE seq > ?", (seq,)
+        ).fetchone()
+        if first[0] is None:
+            return TaskChanges(seq, [], [])
+        if first[0] > seq + 1:
+            return None
+        ids = [
+            row[0]
+            for row in conn.execute(
+                "SELECT DISTINCT task_id FROM task_changes WHERE seq > ? AND seq <= ?",
+                (seq, first[1]),
+            )
+        ]
+        updated = [
+            TaskSummary.from_row(row)
+            for row in conn.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM tasks WHERE id IN"
+                " (SELECT task_id FROM task_changes WHERE seq > ? AND seq <= ?)",
+                (seq, first[1]),
+            )
+        ]
+        found = {task.id for task in updated}
+        return TaskChanges(first[1], updated, [i for i in ids if i not in found])
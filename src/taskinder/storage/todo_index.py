@@ -0,0 +1,128 @@
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, List, NamedTuple, Optional
+
+from taskinder.scanner.todo_scanner import FileScan, TodoItem, assign_fingerprints
+from taskinder.storage.database import Database
+
+
+class FileState(NamedTuple):
+    mtime_ns: int
+    size: int
+    hash: str
+
+
+class TodoIndex:
+    """Persisted TODO scan results, stored next to the tasks in ``tasks.db``.
+
+    Remembers, per relative file path, the stat and content hash seen at the
+    last scan together with the items extracted from it, so later scans only
+    re-read files whose stat changed.
+    """
+
+    def __init__(self, database: Database) -> None:
+        self.database = database
+        self._connect = database.connect
+
+    def use_config(self, digest: str) -> None:
+        """Forget every cached result if it was extracted under a different
+        scanner configuration, identified by ``digest``."""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value FROM scan_meta WHERE key = 'config'"
+        ).fetchone()
+        if row is not None and row[0] == digest:
+            return
+        with conn:
+            conn.execute("DELETE FROM todos")
+            conn.execute("DELETE FROM scan_files")
+            conn.execute(
+                "INSERT OR REPLACE INTO scan_meta (key, value) VALUES ('config', ?)",
+                (digest,),
+            )
+
+    def file_states(self) -> dict[str, FileState]:
+        rows = (
+            self._connect()
+            .execute("SELECT path, mtime_ns, size, hash FROM scan_files")
+            .fetchall()
+        )
+        return {
+            path: FileState(mtime_ns, size, hash_)
+            for path, mtime_ns, size, hash_ in rows
+        }
+
+    def apply(self, scanned: Iterable[FileScan], removed: Iterable[str]) -> None:
+        """Record new scan results and forget deleted files, in one transaction.
+
+        Items are only rewritten for files whose content hash changed; a file
+        that was merely touched just gets its new stat recorded.
+        """
+        scanned = list(scanned)
+        removed = [(path,) for path in removed]
+        with self._connect() as conn:
+            hashes = dict(conn.execute("SELECT path, hash FROM scan_files").fetchall())
+            changed = [scan for scan in scanned if hashes.get(scan.path) != scan.hash]
+            conn.executemany("DELETE FROM scan_files WHERE path = ?", removed)
+            conn.executemany("DELETE FROM todos WHERE path = ?", removed)
+            conn.executemany(
+                "DELETE FROM todos WHERE path = ?", ((scan.path,) for scan in changed)
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO scan_files (path, mtime_ns, size, hash)"
+                " VALUES (?, ?, ?, ?)",
+                ((scan.path, scan.mtime_ns, scan.size, scan.hash) for scan in scanned),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO todos (path, line, kind, text)"
+                " VALUES (?, ?, ?, ?)",
+                (
+                    (item.file, item.line, item.kind, item.text)
+                    for scan in changed
+                    for item in scan.items
+                ),
+            )
+
+    def items(self) -> List[TodoItem]:
+        """All indexed items, ordered by (file, line)."""
+        return self.query()
+
+    def query(
+        self, kinds: Optional[Iterable[str]] = None, file_glob: Optional[str] = None
+    ) -> List[TodoItem]:
+        """Indexed items matching every given filter, ordered by (file, line).
+
+        ``file_glob`` is matched against the relative path with SQLite
+        ``GLOB`` semantics, where ``*`` also crosses ``/``.
+        """
+        return [
+            item for items in self._grouped(kinds, file_glob).values() for item in items
+        ]
+
+    def items_by_path(self) -> dict[str, List[TodoItem]]:
+        """Indexed items grouped by file, each group ordered by line."""
+        return self._grouped()
+
+    def _grouped(
+        self, kinds: Optional[Iterable[str]] = None, file_glob: Optional[str] = None
+    ) -> dict[str, List[TodoItem]]:
+        clauses: List[str] = []
+        params: List[str] = []
+        if kinds:
+            kinds = [kind.upper() for kind in kinds]
+            clauses.append(f"kind IN ({', '.join('?' * len(kinds))})")
+            params.extend(kinds)
+        if file_glob:
+            clauses.append("path GLOB ?")
+            params.append(file_glob)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(
+            f"SELECT path, line, kind, text FROM todos{where} ORDER BY path, line",
+            params,
+        )
+        # Fingerprints count repeats per (file, kind, text), so whole files or
+        # whole kinds per file are enough to compute them correctly.
+        return {
+            path: assign_fingerprints([TodoItem(*row) for row in group])
+            for path, group in groupby(rows, itemgetter(0))
+        }
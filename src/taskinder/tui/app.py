@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import threading
 from pathlib import Path
 
-from textual.app import App, ComposeResult
+from textual.app import App
 from textual.binding import Binding
 
-from taskinder.core import TaskService
+from taskinder.core import AsyncTaskService, TaskService
+from taskinder.scanner.todo_scanner import TodoScanner
+from taskinder.scanner.watcher import TodoWatcher
 from taskinder.storage.task_repository import TaskRepository
+from taskinder.storage.todo_index import TodoIndex
 from taskinder.tui.themes.manager import ThemeManager
 
 
@@ -24,12 +28,21 @@ class TaskinderApp(App):
     }
     """
 
-    def __init__(self, project_dir: Path | None = None) -> None:
+    def __init__(self, project_dir: Path | None = None, watch: bool = False) -> None:
         super().__init__()
         self.project_dir = project_dir or Path.cwd()
         db_path = self.project_dir / ".taskinder" / "tasks.db"
         self.repository = TaskRepository(db_path)
-        self.service = TaskService(self.repository)
+        # Every TUI database call goes through the service's own thread.
+        self.service = AsyncTaskService(TaskService(self.repository))
+        self.todo_index = TodoIndex(self.repository.database)
+        self.todo_watcher: TodoWatcher | None = None
+        if watch:
+            self.todo_watcher = TodoWatcher(
+                TodoScanner(index=self.todo_index), self.project_dir
+            )
+        self._watch_stop = threading.Event()
+        self._watch_thread: threading.Thread | None = None
         self.theme_manager = ThemeManager()
 
     def on_mount(self) -> None:
@@ -46,4 +59,44 @@ class TaskinderApp(App):
             pass
 
         from taskinder.tui.screens.main_screen import MainScreen
+
         self.push_screen(MainScreen())
+
+        if self.todo_watcher is not None:
+            self._watch_thread = threading.Thread(
+                target=self.todo_watcher.run,
+                args=(
+                    self._post_todos_changed,
+                    self._watch_stop,
+                    self._post_watch_error,
+                ),
+                name="todo-watch",
+                daemon=True,
+            )
+            self._watch_thread.start()
+
+    def _post_todos_changed(self) -> None:
+        # Called on the watcher thread; the app may already be shutting down.
+        try:
+            self.call_from_thread(self._todos_changed)
+        except RuntimeError:
+            pass
+
+    def _post_watch_error(self, error: ValueError) -> None:
+        try:
+            self.call_from_thread(self.notify, str(error), severity="error")
+        except RuntimeError:
+            pass
+
+    def _todos_changed(self) -> None:
+        from taskinder.tui.screens.todo_screen import TodoScreen
+
+        if isinstance(self.screen, TodoScreen):
+            self.screen.reload()
+
+    def on_unmount(self) -> None:
+        self._watch_stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join(timeout=2)
+        self.service.close()
+        self.repository.close()
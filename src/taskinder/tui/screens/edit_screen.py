@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import uuid
+from dataclasses import replace
+from datetime import datetime
+
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, Vertical
@@ -9,7 +13,7 @@ from textual.widgets import Button, Input, Label, Select, TextArea
 from taskinder.models.task import Task, TaskStatus
 
 
-class EditScreen(ModalScreen[bool]):
+class EditScreen(ModalScreen[Task | None]):
     BINDINGS = [
         Binding("ctrl+s", "save", "Save"),
         Binding("escape", "cancel", "Cancel"),
@@ -78,7 +82,9 @@ class EditScreen(ModalScreen[bool]):
         with Vertical(id="edit-dialog"):
             yield Label(heading, id="edit-heading")
             yield Label("Title", classes="field-label")
-            yield Input(value=title_val, placeholder="What needs to be done?", id="input-title")
+            yield Input(
+                value=title_val, placeholder="What needs to be done?", id="input-title"
+            )
             yield Label("Description", classes="field-label")
             yield TextArea(text=desc_val, id="input-desc")
             yield Label("Status", classes="field-label")
@@ -103,20 +109,29 @@ class EditScreen(ModalScreen[bool]):
 
         desc = self.query_one("#input-desc", TextArea).text.strip()
         status_raw = self.query_one("#input-status", Select).value
-        status = status_raw if isinstance(status_raw, TaskStatus) else TaskStatus(str(status_raw))
-
-        service = self.app.service  # type: ignore[attr-defined]
+        status = (
+            status_raw
+            if isinstance(status_raw, TaskStatus)
+            else TaskStatus(str(status_raw))
+        )
+
+        # the caller shows the task at once and writes it in the background
+        now = datetime.now()
         if self.is_editing:
-            service.update_task_by_id(self.__source.id, title=title, description=desc, status=status)
+            draft = replace(
+                self.__source,
+                title=title,
+                description=desc,
+                status=status,
+                updated_at=now,
+            )
         else:
-            new_task = service.create_task(title, desc)
-            if status != TaskStatus.TODO:
-                service.update_task_by_id(new_task.id, status=status)
+            draft = Task(str(uuid.uuid4()), title, desc, status, now, now)
 
-        self.dismiss(True)
+        self.dismiss(draft)
 
     def action_cancel(self) -> None:
-        self.dismiss(False)
+        self.dismiss(None)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "btn-save":
@@ -1,15 +1,30 @@
 from __future__ import annotations
 
+import asyncio
+import sqlite3
+from dataclasses import replace
+from datetime import datetime
+from functools import partial
 from pathlib import Path
 
+from textual import work
 from textual.app import ComposeResult
 from textual.binding import Binding
-from textual.containers import Horizontal, Vertical
+from textual.containers import Vertical
 from textual.screen import Screen
-from textual.widgets import Footer, Label, Static, TabbedContent, TabPane
+from textual.widgets import Footer, Input, Label, Static, TabbedContent, TabPane
 
-from taskinder.models.task import Task, TaskStatus
-from taskinder.tui.widgets.task_item import TaskItem, TaskListView
+from taskinder.models.task import Task, TaskStatus, TaskSummary
+from taskinder.tui.widgets.task_list import TaskListView
+
+TABS = ("all", "todo", "doing", "done")
+# Seconds between checks for tasks written by other processes.
+CHANGE_POLL_INTERVAL = 1.0
+TAB_STATUSES: dict[str, TaskStatus] = {
+    "todo": TaskStatus.TODO,
+    "doing": TaskStatus.DOING,
+    "done": TaskStatus.DONE,
+}
 
 
 class ProjectHeader(Static):
@@ -53,9 +68,9 @@ class ProjectHeader(Static):
             yield Label("  loading…", id="header-stats")
 
     def update_counts(self, counts: dict[str, int]) -> None:
-        todo  = counts.get("TODO", 0)
+        todo = counts.get("TODO", 0)
         doing = counts.get("DOING", 0)
-        done  = counts.get("DONE", 0)
+        done = counts.get("DONE", 0)
         self.query_one("#header-stats", Label).update(
             f"  [bold yellow]󰄱[/bold yellow]  {todo} "
             f"[dim]·[/dim]  [bold blue]󰑓[/bold blue]  {doing} "
@@ -65,25 +80,27 @@ class ProjectHeader(Static):
 
 class MainScreen(Screen):
     BINDINGS = [
-        Binding("j",     "cursor_down",        "Down",   show=False),
-        Binding("k",     "cursor_up",           "Up",     show=False),
-        Binding("down",  "cursor_down",         show=False),
-        Binding("up",    "cursor_up",           show=False),
-        Binding("h",     "prev_tab",            "←",      show=False),
-        Binding("l",     "next_tab",            "→",      show=False),
-        Binding("n",     "new_task",            "New"),
-        Binding("e",     "edit_task",           "Edit"),
-        Binding("d",     "delete_task",         "Delete"),
-        Binding("space", "toggle_status",       "Toggle"),
-        Binding("enter", "toggle_status",       show=False),
-        Binding("t",     "scan_todos",          "TODOs"),
-        Binding("T",     "switch_theme",        "Theme"),
-        Binding("q",     "app.quit",            "Quit"),
-        Binding("question_mark", "show_help",   show=False),
-        Binding("1",     "filter_tab('all')",   show=False),
-        Binding("2",     "filter_tab('todo')",  show=False),
-        Binding("3",     "filter_tab('doing')", show=False),
-        Binding("4",     "filter_tab('done')",  show=False),
+        Binding("j", "cursor_down", "Down", show=False),
+        Binding("k", "cursor_up", "Up", show=False),
+        Binding("down", "cursor_down", show=False),
+        Binding("up", "cursor_up", show=False),
+        Binding("h", "prev_tab", "←", show=False),
+        Binding("l", "next_tab", "→", show=False),
+        Binding("n", "new_task", "New"),
+        Binding("e", "edit_task", "Edit"),
+        Binding("d", "delete_task", "Delete"),
+        Binding("space", "toggle_status", "Toggle"),
+        Binding("enter", "toggle_status", show=False),
+        Binding("slash", "search", "Search"),
+        Binding("escape", "clear_search", show=False),
+        Binding("t", "scan_todos", "TODOs"),
+        Binding("T", "switch_theme", "Theme"),
+        Binding("q", "app.quit", "Quit"),
+        Binding("question_mark", "show_help", show=False),
+        Binding("1", "filter_tab('all')", show=False),
+        Binding("2", "filter_tab('todo')", show=False),
+        Binding("3", "filter_tab('doing')", show=False),
+        Binding("4", "filter_tab('done')", show=False),
     ]
 
     DEFAULT_CSS = """
@@ -93,6 +110,15 @@ class MainScreen(Screen):
         overflow-y: hidden;
     }
 
+    /* ── search ────────────────────────────────── */
+    #search-box {
+        display: none;
+        margin: 0 1;
+    }
+    #search-box.-active {
+        display: block;
+    }
+
     /* ── tabs ──────────────────────────────────── */
     TabbedContent {
         height: 1fr;
@@ -101,117 +127,250 @@ class MainScreen(Screen):
         padding: 0;
         background: $background;
     }
-
-    /* ── list ──────────────────────────────────── */
-    TaskListView {
-        background: $background;
-        height: 1fr;
-    }
-    TaskItem {
-        height: auto;
-        padding: 0 1;
-        border-left: blank $background;
-    }
-    TaskItem:hover {
-        background: $surface;
-        border-left: thick $panel;
-    }
-    TaskItem.--highlight {
-        background: $surface;
-        border-left: thick $primary;
-    }
-
-    /* ── task item internals ────────────────────── */
-    .item-body {
-        width: 1fr;
-        height: auto;
-        padding: 1 0;
-    }
-    .item-row-main {
-        height: 1;
-        width: 1fr;
-    }
-    .item-row-desc {
-        height: 1;
-        width: 1fr;
-    }
-    .task-icon {
-        width: 3;
-        text-style: bold;
-    }
-    .task-icon-spacer {
-        width: 3;
-    }
-    TaskItem.todo  .task-icon { color: $warning; }
-    TaskItem.doing .task-icon { color: $secondary; }
-    TaskItem.done  .task-icon { color: $success; }
-
-    .task-title {
-        width: 1fr;
-        color: $foreground;
-    }
-    TaskItem.done .task-title {
-        color: $text-muted;
-        text-style: dim strike;
-    }
-    .task-desc {
-        width: 1fr;
-        color: $text-muted;
-        text-style: dim;
-    }
-    .task-time {
-        width: 8;
-        text-align: right;
-        color: $text-muted;
-        text-style: dim;
-    }
     """
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._search = ""
+        self._counts: dict[str, int] = {}
+        # tabs whose list is current or being loaded; the rest are stale
+        self._loaded: set[str] = set()
+        # changes shown but not yet written, by write sequence number
+        self._write_seq = 0
+        self._pending: dict[int, tuple[TaskSummary | None, TaskSummary | None]] = {}
+        # last change-log entry and data_version the lists are known to reflect
+        self._change_seq = 0
+        self._data_version: int | None = None
+
     def compose(self) -> ComposeResult:
         yield ProjectHeader()
+        # disabled while hidden so it never takes focus (and keystrokes) on mount
+        yield Input(placeholder="Search tasks…", id="search-box", disabled=True)
         with TabbedContent(initial="all"):
-            with TabPane("󰈚  All",    id="all"):
+            with TabPane("󰈚  All", id="all"):
                 yield TaskListView(id="list-all")
-            with TabPane("󰄱  Todo",   id="todo"):
+            with TabPane("󰄱  Todo", id="todo"):
                 yield TaskListView(id="list-todo")
-            with TabPane("󰑓  Doing",  id="doing"):
+            with TabPane("󰑓  Doing", id="doing"):
                 yield TaskListView(id="list-doing")
-            with TabPane("󰄲  Done",   id="done"):
+            with TabPane("󰄲  Done", id="done"):
                 yield TaskListView(id="list-done")
         yield Footer()
 
     def on_mount(self) -> None:
         self.refresh_tasks()
+        self.set_interval(CHANGE_POLL_INTERVAL, self._poll_changes)
 
     def _active_list(self) -> TaskListView:
         active = self.query_one(TabbedContent).active
         return self.query_one(f"#list-{active}", TaskListView)
 
-    def _selected_task(self) -> Task | None:
-        item = self._active_list().highlighted_child
-        if isinstance(item, TaskItem):
-            return item.data
-        return None
+    def _selected_task(self) -> TaskSummary | None:
+        return self._active_list().highlighted_task
 
     def refresh_tasks(self) -> None:
-        service = self.app.service       # type: ignore[attr-defined]
-        repo    = self.app.repository    # type: ignore[attr-defined]
-        tasks   = service.get_all_tasks()
-        counts  = repo.count()
+        """Reload the header counts and the visible tab from the database.
+
+        Hidden tabs are only marked stale; each is reloaded when next shown.
+        """
+        self._loaded.clear()
+        # queued ahead of the loads, so no change can fall between them
+        self.run_worker(self._rebase(self.app.service.latest_change()), group="rebase")  # type: ignore[attr-defined]
+        self.run_worker(self._load_counts(), group="counts", exclusive=True)
+        self._show_tab(self.query_one(TabbedContent).active or "all")
+
+    def _show_tab(self, tab_id: str) -> None:
+        self._loaded.add(tab_id)
+        self.run_worker(self._load_tab(tab_id), group=f"load-{tab_id}", exclusive=True)
+
+    async def _rebase(self, latest: asyncio.Future) -> None:
+        self._change_seq = max(self._change_seq, await latest)
+
+    def _poll_changes(self) -> None:
+        self.run_worker(self._check_changes(), group="changes", exclusive=True)
+
+    async def _check_changes(self) -> None:
+        """Pick up tasks written by other processes, e.g. ``taskinder add``
+        in another pane, patching just the rows they touched."""
+        service = self.app.service  # type: ignore[attr-defined]
+        version = await service.data_version()
+        if version == self._data_version:
+            return
+        seq = self._write_seq
+        changes = await service.changes_since(self._change_seq)
+        self._data_version = version
+        if changes is None:
+            # too far behind for the change log; start over
+            self.refresh_tasks()
+            return
+        self._change_seq = max(self._change_seq, changes.seq)
+        if not changes.updated and not changes.deleted:
+            return
+        for tab_id in self._loaded:
+            lv = self.query_one(f"#list-{tab_id}", TaskListView)
+            for task in changes.updated:
+                self._patch_tab(tab_id, None, task)
+            for task_id in changes.deleted:
+                lv.remove_id(task_id)
+            for before, after in self._pending_since(seq):
+                self._patch_tab(tab_id, before, after)
+        self.run_worker(self._load_counts(), group="counts", exclusive=True)
+
+    async def _load_counts(self) -> None:
+        seq = self._write_seq
+        counts = await self.app.service.count()  # type: ignore[attr-defined]
+        for before, after in self._pending_since(seq):
+            self._count_change(counts, before, after)
+        self._counts = counts
         self.query_one(ProjectHeader).update_counts(counts)
 
-        groups: dict[str, list[Task]] = {
-            "all":   tasks,
-            "todo":  [t for t in tasks if t.status == TaskStatus.TODO],
-            "doing": [t for t in tasks if t.status == TaskStatus.DOING],
-            "done":  [t for t in tasks if t.status == TaskStatus.DONE],
-        }
-        for tab_id, task_list in groups.items():
-            lv = self.query_one(f"#list-{tab_id}", TaskListView)
-            lv.clear()
-            for task in task_list:
-                lv.append(TaskItem(task))
-            lv.call_after_refresh(lv.sync_state)
+    async def _load_tab(self, tab_id: str) -> None:
+        service = self.app.service  # type: ignore[attr-defined]
+        seq = self._write_seq
+        if tab_id != "all":
+            tasks = await service.query_summaries(status=TAB_STATUSES[tab_id])
+        elif self._search:
+            tasks = await service.search_summaries(self._search, limit=200)
+        else:
+            tasks = await service.query_summaries()
+        ranked = tab_id == "all" and bool(self._search)
+        self.query_one(f"#list-{tab_id}", TaskListView).set_tasks(tasks, ranked=ranked)
+        for before, after in self._pending_since(seq):
+            self._patch_tab(tab_id, before, after)
+
+    def _pending_since(
+        self, seq: int
+    ) -> list[tuple[TaskSummary | None, TaskSummary | None]]:
+        # Writes queued after a read was: the read ran before them, so its
+        # result still lacks them.
+        return [change for write, change in self._pending.items() if write > seq]
+
+    def on_tabbed_content_tab_activated(
+        self, event: TabbedContent.TabActivated
+    ) -> None:
+        tab_id = event.pane.id
+        if tab_id in TABS and tab_id not in self._loaded:
+            self._show_tab(tab_id)
+
+    def _apply_change(
+        self, before: TaskSummary | None, after: TaskSummary | None
+    ) -> None:
+        """Patch the lists and counts for one task: ``before`` is how it was
+        listed (None if new), ``after`` how it is now (None once deleted)."""
+        # tabs not loaded yet pick the change up when they are shown
+        for tab_id in self._loaded:
+            self._patch_tab(tab_id, before, after)
+        self._count_change(self._counts, before, after)
+        self.query_one(ProjectHeader).update_counts(self._counts)
+
+    def _patch_tab(
+        self, tab_id: str, before: TaskSummary | None, after: TaskSummary | None
+    ) -> None:
+        listed = after or before
+        if listed is None:
+            return
+        lv = self.query_one(f"#list-{tab_id}", TaskListView)
+        status = TAB_STATUSES.get(tab_id)
+        if after is not None and status in (None, after.status):
+            # search results are ranked; new tasks don't join them
+            if not lv.update_task(after) and not (tab_id == "all" and self._search):
+                lv.insert_task(after)
+        else:
+            lv.remove_task(listed)
+
+    @staticmethod
+    def _count_change(
+        counts: dict[str, int], before: TaskSummary | None, after: TaskSummary | None
+    ) -> None:
+        if before is not None:
+            counts[before.status.value] = counts.get(before.status.value, 0) - 1
+        if after is not None:
+            counts[after.status.value] = counts.get(after.status.value, 0) + 1
+
+    def _mutate(
+        self,
+        before: TaskSummary | None,
+        after: TaskSummary | None,
+        write: asyncio.Future,
+    ) -> None:
+        """Show a change right away, then settle it once ``write``, the
+        queued database call making it, is done."""
+        self._write_seq += 1
+        self._pending[self._write_seq] = (before, after)
+        self._apply_change(before, after)
+        self.run_worker(
+            self._settle(self._write_seq, before, after, write), group="writes"
+        )
+
+    async def _settle(
+        self,
+        seq: int,
+        before: TaskSummary | None,
+        after: TaskSummary | None,
+        write: asyncio.Future,
+    ) -> None:
+        try:
+            # shielded: leaving the screen must not cancel a queued write
+            saved = await asyncio.shield(write)
+        except (sqlite3.Error, ValueError) as e:
+            self.app.notify(f"Could not save the change: {e}", severity="error")
+            self._pending.pop(seq, None)
+            # roll back, unless a later change to the same task is shown
+            if self._superseded(seq, after or before):
+                self.refresh_tasks()
+            else:
+                self._apply_change(after, before)
+            return
+        self._pending.pop(seq, None)
+        if saved is None:
+            self._task_gone()
+        elif after is not None and not self._superseded(seq, after):
+            # take the stored timestamps over the optimistic ones
+            self._apply_change(after, TaskSummary.from_task(saved))
+
+    def _superseded(self, seq: int, task: TaskSummary | None) -> bool:
+        """Whether a change queued after ``seq`` touches ``task`` too."""
+        if task is None:
+            return False
+        return any(
+            any(t is not None and t.id == task.id for t in change)
+            for write, change in self._pending.items()
+            if write > seq
+        )
+
+    def _task_gone(self) -> None:
+        self.app.notify("Task no longer exists.", severity="warning")
+        self.refresh_tasks()
+
+    def action_search(self) -> None:
+        box = self.query_one("#search-box", Input)
+        box.disabled = False
+        box.add_class("-active")
+        box.focus()
+
+    def action_clear_search(self) -> None:
+        box = self.query_one("#search-box", Input)
+        if not box.has_class("-active"):
+            return
+        box.remove_class("-active")
+        box.value = ""
+        box.disabled = True
+        self._active_list().focus()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if event.input.id != "search-box":
+            return
+        self._search = event.value.strip()
+        self._loaded.discard("all")
+        tc = self.query_one(TabbedContent)
+        if self._search:
+            tc.active = "all"
+        if tc.active == "all":
+            self._show_tab("all")
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        if event.input.id == "search-box":
+            self._active_list().focus()
 
     def action_cursor_down(self) -> None:
         self._active_list().action_cursor_down()
@@ -220,60 +379,96 @@ class MainScreen(Screen):
         self._active_list().action_cursor_up()
 
     def action_prev_tab(self) -> None:
-        tabs = ["all", "todo", "doing", "done"]
         tc = self.query_one(TabbedContent)
-        idx = tabs.index(tc.active) if tc.active in tabs else 0
-        tc.active = tabs[(idx - 1) % len(tabs)]
+        idx = TABS.index(tc.active) if tc.active in TABS else 0
+        tc.active = TABS[(idx - 1) % len(TABS)]
 
     def action_next_tab(self) -> None:
-        tabs = ["all", "todo", "doing", "done"]
         tc = self.query_one(TabbedContent)
-        idx = tabs.index(tc.active) if tc.active in tabs else 0
-        tc.active = tabs[(idx + 1) % len(tabs)]
+        idx = TABS.index(tc.active) if tc.active in TABS else 0
+        tc.active = TABS[(idx + 1) % len(TABS)]
 
     def action_toggle_status(self) -> None:
         task = self._selected_task()
         if not task:
             return
         cycle = {
-            TaskStatus.TODO:  TaskStatus.DOING,
+            TaskStatus.TODO: TaskStatus.DOING,
             TaskStatus.DOING: TaskStatus.DONE,
-            TaskStatus.DONE:  TaskStatus.TODO,
+            TaskStatus.DONE: TaskStatus.TODO,
         }
-        self.app.service.update_task_by_id(task.id, status=cycle[task.status])  # type: ignore[attr-defined]
-        self.refresh_tasks()
+        status = cycle[task.status]
+        write = self.app.service.update_task_by_id(task.id, status=status)  # type: ignore[attr-defined]
+        self._mutate(
+            task, replace(task, status=status, updated_at=datetime.now()), write
+        )
 
     def action_new_task(self) -> None:
         from taskinder.tui.screens.edit_screen import EditScreen
-        self.app.push_screen(EditScreen(), self._after_edit)
 
-    def action_edit_task(self) -> None:
-        task = self._selected_task()
-        if not task:
+        self.app.push_screen(EditScreen(), partial(self._after_edit, None))
+
+    @work(exclusive=True, group="edit")
+    async def action_edit_task(self) -> None:
+        selected = self._selected_task()
+        if not selected:
             self.app.notify("No task selected.", severity="warning")
             return
+        # list rows only carry a preview; load the full description now
+        task = await self.app.service.get_task_by_id(selected.id)  # type: ignore[attr-defined]
+        if not task:
+            self._task_gone()
+            return
         from taskinder.tui.screens.edit_screen import EditScreen
-        self.app.push_screen(EditScreen(task=task), self._after_edit)
 
-    def _after_edit(self, saved: bool) -> None:
-        if saved:
-            self.refresh_tasks()
+        self.app.push_screen(
+            EditScreen(task=task),
+            partial(self._after_edit, TaskSummary.from_task(task)),
+        )
+
+    def _after_edit(self, before: TaskSummary | None, draft: Task | None) -> None:
+        if draft is None:
+            return
+        service = self.app.service  # type: ignore[attr-defined]
+        if before is None:
+            write = service.create_task(
+                draft.title,
+                draft.description,
+                draft.status,
+                draft.created_at,
+                draft.updated_at,
+                task_id=draft.id,
+            )
+        else:
+            write = service.update_task_by_id(
+                draft.id,
+                title=draft.title,
+                description=draft.description,
+                status=draft.status,
+            )
+        self._mutate(before, TaskSummary.from_task(draft), write)
 
     def action_delete_task(self) -> None:
         task = self._selected_task()
         if not task:
             self.app.notify("No task selected.", severity="warning")
             return
-        self.app.service.delete_task_by_id(task.id)  # type: ignore[attr-defined]
+        write = self.app.service.delete_task_by_id(task.id)  # type: ignore[attr-defined]
         self.app.notify(f"Deleted: {task.title[:40]}", severity="warning")
-        self.refresh_tasks()
+        self._mutate(task, None, write)
 
     def action_scan_todos(self) -> None:
         from taskinder.tui.screens.todo_screen import TodoScreen
-        self.app.push_screen(TodoScreen(self.app.project_dir))  # type: ignore[attr-defined]
+
+        self.app.push_screen(TodoScreen(self.app.project_dir), self._after_scan)  # type: ignore[attr-defined]
+
+    def _after_scan(self, imported: bool) -> None:
+        if imported:
+            self.refresh_tasks()
 
     def action_switch_theme(self) -> None:
         from taskinder.tui.screens.theme_screen import ThemeScreen
+
         self.app.push_screen(ThemeScreen())
 
     def action_filter_tab(self, tab_id: str) -> None:
@@ -285,6 +480,7 @@ class MainScreen(Screen):
             "space   toggle status     n  new task\n"
             "e       edit task         d  delete\n"
             "t       scan TODOs        T  theme\n"
+            "/       search            esc  clear search\n"
             "1-4     jump to tab       q  quit",
             title="  Keybindings",
             timeout=8,
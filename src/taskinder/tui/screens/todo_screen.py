@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import sqlite3
+import time
 from pathlib import Path
 
+from textual import work
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Vertical
 from textual.screen import ModalScreen
-from textual.widgets import DataTable, Footer, Label
+from textual.widgets import DataTable, Footer, Input, Label
+from textual.worker import Worker, get_current_worker
+
+from taskinder.scanner.config import DEFAULT_CONFIG, load_config
+from taskinder.scanner.todo_scanner import TodoItem, TodoScanner
+
+# Seconds between pushing scanned rows to the table while a scan runs.
+FLUSH_INTERVAL = 0.1
 
 
 class TodoScreen(ModalScreen[bool]):
@@ -14,7 +25,11 @@ class TodoScreen(ModalScreen[bool]):
         Binding("escape", "cancel", "Back"),
         Binding("j", "move_down", "Down", show=False),
         Binding("k", "move_up", "Up", show=False),
+        Binding("space", "toggle_mark", "Mark"),
+        Binding("a", "mark_all", "Mark all"),
         Binding("i", "import_task", "Import"),
+        Binding("f", "cycle_kind", "Kind"),
+        Binding("slash", "filter_files", "Files"),
     ]
 
     DEFAULT_CSS = """
@@ -38,6 +53,13 @@ class TodoScreen(ModalScreen[bool]):
     #scan-table {
         height: 1fr;
     }
+    #todo-filter {
+        display: none;
+        margin-bottom: 1;
+    }
+    #todo-filter.-active {
+        display: block;
+    }
     #scan-hint {
         color: $text-muted;
         text-style: dim;
@@ -49,32 +71,173 @@ class TodoScreen(ModalScreen[bool]):
     def __init__(self, project_dir: Path) -> None:
         super().__init__()
         self.project_dir = project_dir
+        # Rows are keyed by item fingerprint, so marks survive a reload.
+        self._items: dict[str, TodoItem] = {}
+        self._marked: set[str] = set()
+        self._scan_worker: Worker[None] | None = None
+        # Kind filters cycled with ``f``; ``None`` shows every kind.
+        self._kinds: tuple[str | None, ...] = (None, *DEFAULT_CONFIG.markers)
+        self._kind: str | None = None
+        self._file_glob = ""
+        # Dismissed with whether any task was created.
+        self._imported = False
 
     def compose(self) -> ComposeResult:
         with Vertical(id="scan-dialog"):
             yield Label("  Scanning for TODOs…", id="scan-heading")
+            # disabled while hidden so it never takes focus (and keystrokes) on mount
+            yield Input(
+                placeholder="Filter files, e.g. src/*.py",
+                id="todo-filter",
+                disabled=True,
+            )
             yield DataTable(id="scan-table", cursor_type="row")
-            yield Label("i: import as task  ·  esc: back", id="scan-hint")
+            yield Label(
+                "space: mark  ·  a: mark all  ·  i: import marked (or selected)  ·  "
+                "f: kind  ·  /: files  ·  esc: back",
+                id="scan-hint",
+            )
         yield Footer()
 
     def on_mount(self) -> None:
-        from taskinder.scanner.todo_scanner import TodoScanner
+        table = self.query_one("#scan-table", DataTable)
+        self._mark_column = table.add_column(" ", width=1)
+        self._kind_column, self._file_column, self._line_column, _ = table.add_columns(
+            "Kind", "File", "Line", "Text"
+        )
+        try:
+            self._kinds = (None, *load_config(self.project_dir).markers)
+        except ValueError:
+            pass  # Reported by the scan; the default markers still apply.
+        if self.app.todo_watcher is not None:  # type: ignore[attr-defined]
+            # The watcher keeps the index current: no scan needed.
+            self.reload()
+        else:
+            self._scan_worker = self._scan()
 
+    @work(exclusive=True, group="reload")
+    async def reload(self) -> None:
+        """Show the indexed items that pass the filters, keeping marks and
+        the cursor where possible."""
+        items = await self.app.service.run(  # type: ignore[attr-defined]
+            self.app.todo_index.query,  # type: ignore[attr-defined]
+            kinds=[self._kind] if self._kind else None,
+            file_glob=self._file_glob or None,
+        )
         table = self.query_one("#scan-table", DataTable)
-        table.add_columns("Kind", "File", "Line", "Text")
+        cursor = self._cursor_key()
+        table.clear()
+        self._items = {}
+        for item in items:
+            self._items[item.fingerprint] = item
+            table.add_row(
+                "●" if item.fingerprint in self._marked else "",
+                item.kind,
+                item.file,
+                item.line,
+                item.text,
+                key=item.fingerprint,
+            )
+        self._marked &= self._items.keys()
+        if cursor in self._items:
+            table.move_cursor(row=table.get_row_index(cursor))
+        count = len(self._items)
+        parts = [
+            f"{count} item{'s' if count != 1 else ''}" if count else "No TODOs found"
+        ]
+        parts += [f for f in (self._kind, self._file_glob) if f]
+        if self.app.todo_watcher is not None:  # type: ignore[attr-defined]
+            parts.append("watching for changes")
+        self.query_one("#scan-heading", Label).update("  " + "  ·  ".join(parts))
 
-        scanner = TodoScanner()
-        items = scanner.scan(self.project_dir)
+    def _scanning(self) -> bool:
+        return self._scan_worker is not None and self._scan_worker.is_running
 
-        if items:
+    def action_cycle_kind(self) -> None:
+        if self._scanning():
+            self.app.notify("Filters apply once the scan finishes")
+            return
+        self._kind = self._kinds[(self._kinds.index(self._kind) + 1) % len(self._kinds)]
+        self.reload()
+
+    def action_filter_files(self) -> None:
+        if self._scanning():
+            self.app.notify("Filters apply once the scan finishes")
+            return
+        box = self.query_one("#todo-filter", Input)
+        box.disabled = False
+        box.add_class("-active")
+        box.focus()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        value = event.value.strip()
+        # Plain text matches anywhere in the path; anything else is a glob.
+        if value and not any(c in value for c in "*?["):
+            value = f"*{value}*"
+        self._file_glob = value
+        self.reload()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        self.query_one("#scan-table", DataTable).focus()
+
+    @work(thread=True, exclusive=True)
+    def _scan(self) -> None:
+        """Scan in a thread, handing rows to the UI in batches as they arrive."""
+        worker = get_current_worker()
+        scanner = TodoScanner(index=self.app.todo_index)  # type: ignore[attr-defined]
+        try:
+            # Polled per directory and file, so cancelling stops the I/O too.
+            items = scanner.iter_scan(
+                self.project_dir, should_stop=lambda: worker.is_cancelled
+            )
+        except ValueError as e:
+            self.app.call_from_thread(self.app.notify, str(e), severity="error")
+            self.app.call_from_thread(self._finish_scan, "found")
+            return
+        batch: list[TodoItem] = []
+        flushed = time.monotonic()
+        try:
             for item in items:
-                table.add_row(item.kind, item.file, str(item.line), item.text)
-            count = len(items)
-            self.query_one("#scan-heading", Label).update(
-                f"  {count} item{'s' if count != 1 else ''} found"
+                if worker.is_cancelled:
+                    return
+                batch.append(item)
+                if time.monotonic() - flushed >= FLUSH_INTERVAL:
+                    self.app.call_from_thread(self._add_rows, batch)
+                    batch = []
+                    flushed = time.monotonic()
+        finally:
+            items.close()
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self._add_rows, batch)
+            self.app.call_from_thread(self._finish_scan, "found")
+
+    def _add_rows(self, batch: list[TodoItem]) -> None:
+        if self._scan_worker is None:
+            return
+        table = self.query_one("#scan-table", DataTable)
+        for item in batch:
+            self._items[item.fingerprint] = item
+            table.add_row(
+                "", item.kind, item.file, item.line, item.text, key=item.fingerprint
+            )
+        count = len(self._items)
+        self.query_one("#scan-heading", Label).update(
+            f"  Scanning… {count} item{'s' if count != 1 else ''} so far"
+        )
+
+    def _finish_scan(self, outcome: str) -> None:
+        self._scan_worker = None
+        count = len(self._items)
+        heading = self.query_one("#scan-heading", Label)
+        if count:
+            self.query_one("#scan-table", DataTable).sort(
+                self._file_column, self._line_column
             )
+            heading.update(f"  {count} item{'s' if count != 1 else ''} {outcome}")
         else:
-            self.query_one("#scan-heading", Label).update("  No TODOs found")
+            heading.update(
+                "  No TODOs found" if outcome == "found" else "  Scan cancelled"
+            )
 
     def action_move_down(self) -> None:
         self.query_one("#scan-table", DataTable).action_scroll_down()
@@ -82,17 +245,81 @@ class TodoScreen(ModalScreen[bool]):
     def action_move_up(self) -> None:
         self.query_one("#scan-table", DataTable).action_scroll_up()
 
-    def action_import_task(self) -> None:
+    def _cursor_key(self) -> str | None:
         table = self.query_one("#scan-table", DataTable)
         if table.row_count == 0:
-            return
+            return None
         row_key, _ = table.coordinate_to_cell_key(table.cursor_coordinate)
-        row_data = table.get_row(row_key)
-        kind, file_, line, text = row_data[0], row_data[1], row_data[2], row_data[3]
-        title = f"{kind}: {text}"
-        desc = f"From {file_}:{line}"
-        self.app.service.create_task(title, desc)  # type: ignore[attr-defined]
-        self.app.notify(f"Task created: {title[:50]}")
+        return row_key.value
+
+    def _set_mark(self, key: str, marked: bool) -> None:
+        if key not in self._items:
+            return
+        if marked:
+            self._marked.add(key)
+        else:
+            self._marked.discard(key)
+        table = self.query_one("#scan-table", DataTable)
+        table.update_cell(key, self._mark_column, "●" if marked else "")
+
+    def action_toggle_mark(self) -> None:
+        key = self._cursor_key()
+        if key is None:
+            return
+        self._set_mark(key, key not in self._marked)
+        self.query_one("#scan-table", DataTable).action_cursor_down()
+
+    def action_mark_all(self) -> None:
+        mark = len(self._marked) < len(self._items)
+        for key in self._items:
+            self._set_mark(key, mark)
+
+    @work(group="import")
+    async def action_import_task(self) -> None:
+        if self._marked:
+            keys = list(self._marked)
+        else:
+            key = self._cursor_key()
+            if key is None:
+                return
+            keys = [key]
+
+        selected = sorted(
+            (self._items[key] for key in keys), key=lambda x: (x.file, x.line)
+        )
+        write = self.app.service.import_tasks(  # type: ignore[attr-defined]
+            item.task_fields() for item in selected
+        )
+        for key in keys:
+            self._set_mark(key, False)
+        try:
+            created = await asyncio.shield(write)
+        except sqlite3.Error as e:
+            self.app.notify(f"Could not import: {e}", severity="error")
+            for key in keys:
+                self._set_mark(key, True)
+            return
+        self._imported = self._imported or created > 0
+        skipped = len(selected) - created
+        if created == 1 and not skipped:
+            item = selected[0]
+            self.app.notify(f"Task created: {f'{item.kind}: {item.text}'[:50]}")
+        elif skipped:
+            self.app.notify(f"{created} tasks created, {skipped} already imported")
+        else:
+            self.app.notify(f"{created} tasks created")
 
     def action_cancel(self) -> None:
-        self.dismiss(False)
+        box = self.query_one("#todo-filter", Input)
+        if box.has_class("-active"):
+            box.remove_class("-active")
+            box.value = ""
+            box.disabled = True
+            self.query_one("#scan-table", DataTable).focus()
+            return
+        if self._scanning():
+            # The first escape stops a running scan and keeps what was found.
+            self._scan_worker.cancel()
+            self._finish_scan("found (scan cancelled)")
+            return
+        self.dismiss(self._imported)
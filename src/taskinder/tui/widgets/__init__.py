@@ -1,3 +1,3 @@
-from taskinder.tui.widgets.task_item import TaskItem, TaskListView
+from taskinder.tui.widgets.task_list import TaskListView
 
-__all__ = ["TaskItem", "TaskListView"]
+__all__ = ["TaskListView"]
@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import datetime
+
+from rich.cells import cell_len, set_cell_size
+from rich.segment import Segment
+from rich.style import Style
+from textual import events
+from textual.binding import Binding
+from textual.cache import LRUCache
+from textual.geometry import Region, Size
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from taskinder.models.task import TaskStatus, TaskSummary
+
+STATUS_ICONS: dict[TaskStatus, str] = {
+    TaskStatus.TODO: "󰄱",
+    TaskStatus.DOING: "󰑓",
+    TaskStatus.DONE: "󰄲",
+}
+
+STATUS_LABELS: dict[TaskStatus, str] = {
+    TaskStatus.TODO: "todo",
+    TaskStatus.DOING: "doing",
+    TaskStatus.DONE: "done",
+}
+
+DESC_WIDTH = 60
+_ICON_WIDTH = 3
+_TIME_WIDTH = 8
+
+# Newlines, tabs and other control characters would break a rendered line.
+_CONTROL_TO_SPACE = dict.fromkeys(
+    [*range(0x20), *range(0x7F, 0xA0), 0x2028, 0x2029], " "
+)
+
+
+def _relative_time(dt: datetime) -> str:
+    delta = datetime.now() - dt
+    secs = int(delta.total_seconds())
+    if secs < 60:
+        return "agora"
+    if secs < 3600:
+        return f"{secs // 60}m"
+    if delta.days == 0:
+        return f"{secs // 3600}h"
+    if delta.days == 1:
+        return "ontem"
+    if delta.days < 7:
+        return f"{delta.days}d"
+    return dt.strftime("%d/%m")
+
+
+def _fit(text: str, width: int) -> str:
+    """Pad or cut ``text`` to exactly ``width`` cells, marking cuts with an ellipsis.
+
+    Control characters become spaces, so the result stays on one line.
+    """
+    if width <= 0:
+        return ""
+    text = text.translate(_CONTROL_TO_SPACE)
+    if cell_len(text) > width:
+        return set_cell_size(text, width - 1) + "…"
+    return set_cell_size(text, width)
+
+
+def _row_height(task: TaskSummary) -> int:
+    # Blank line, title line, optional description line, blank line.
+    return 4 if task.preview else 3
+
+
+class TaskListView(ScrollView, can_focus=True):
+    """A scrolling list of task summaries, drawn with the line API.
+
+    Only the lines in view are rendered, so the cost of a list is one
+    summary per task however long it gets. Rows keep the look of a
+    two-line list item: status icon, title and age, with the start of the
+    description underneath.
+    """
+
+    BINDINGS = [
+        Binding("up", "cursor_up", "Cursor up", show=False),
+        Binding("down", "cursor_down", "Cursor down", show=False),
+    ]
+
+    COMPONENT_CLASSES = {
+        "task-list--row",
+        "task-list--hover",
+        "task-list--highlight",
+        "task-list--todo",
+        "task-list--doing",
+        "task-list--done",
+        "task-list--title",
+        "task-list--title-done",
+        "task-list--desc",
+        "task-list--time",
+    }
+
+    DEFAULT_CSS = """
+    TaskListView {
+        background: $background;
+        height: 1fr;
+        overflow-x: hidden;
+    }
+    TaskListView > .task-list--row       { background: $background; }
+    TaskListView > .task-list--hover     { background: $surface; color: $panel; }
+    TaskListView > .task-list--highlight { background: $surface; color: $primary; }
+    TaskListView > .task-list--todo      { color: $warning; text-style: bold; }
+    TaskListView > .task-list--doing     { color: $secondary; text-style: bold; }
+    TaskListView > .task-list--done      { color: $success; text-style: bold; }
+    TaskListView > .task-list--title     { color: $foreground; }
+    TaskListView > .task-list--title-done {
+        color: $text-muted;
+        text-style: dim strike;
+    }
+    TaskListView > .task-list--desc      { color: $text-muted; text-style: dim; }
+    TaskListView > .task-list--time      { color: $text-muted; text-style: dim; }
+    """
+
+    index: reactive[int | None] = reactive(None, always_update=True)
+    hover_index: reactive[int | None] = reactive(None)
+
+    def __init__(
+        self,
+        *,
+        name: str | None = None,
+        id: str | None = None,
+        classes: str | None = None,
+    ) -> None:
+        super().__init__(name=name, id=id, classes=classes)
+        self._tasks: list[TaskSummary] = []
+        # First line of each row, plus one past the end.
+        self._starts: list[int] = [0]
+        # Rows in search-rank order rather than newest first.
+        self._ranked = False
+        self._line_cache: LRUCache[tuple, Strip] = LRUCache(1024)
+
+    @property
+    def tasks(self) -> list[TaskSummary]:
+        return self._tasks
+
+    @property
+    def highlighted_task(self) -> TaskSummary | None:
+        index = self.index
+        return self._tasks[index] if index is not None else None
+
+    def set_tasks(self, tasks: list[TaskSummary], ranked: bool = False) -> None:
+        """Replace the rows, keeping the cursor on the same task where possible.
+
+        Rows are expected newest first, as ``query_summaries`` returns them,
+        unless ``ranked`` says they are in some other order (search results).
+        """
+        current = self.highlighted_task
+        self._tasks = list(tasks)
+        self._ranked = ranked
+        starts = [0]
+        total = 0
+        for task in self._tasks:
+            total += _row_height(task)
+            starts.append(total)
+        self._starts = starts
+        self._line_cache.clear()
+        self.virtual_size = Size(self.size.width, total)
+
+        index = None
+        if self._tasks:
+            index = min(self.index or 0, len(self._tasks) - 1)
+            if current is not None:
+                index = next(
+                    (i for i, task in enumerate(self._tasks) if task.id == current.id),
+                    index,
+                )
+        self.hover_index = None
+        self.index = index
+        self.refresh()
+
+    def clear(self) -> None:
+        self.set_tasks([])
+
+    # ── keyed updates ──────────────────────────────
+
+    def _bisect(self, task: TaskSummary) -> int:
+        """The first row no newer than ``task`` in the newest-first order.
+
+        Rows created at the same instant follow the database's insertion
+        order, which summaries do not carry; ``row_of`` scans past them.
+        """
+        key = task.created_at
+        lo, hi = 0, len(self._tasks)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._tasks[mid].created_at > key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def row_of(self, task: TaskSummary) -> int | None:
+        if self._ranked:
+            return next((i for i, t in enumerate(self._tasks) if t.id == task.id), None)
+        tasks = self._tasks
+        row = self._bisect(task)
+        while row < len(tasks) and tasks[row].created_at == task.created_at:
+            if tasks[row].id == task.id:
+                return row
+            row += 1
+        return None
+
+    def update_task(self, task: TaskSummary) -> bool:
+        """Redraw the row of ``task`` in place; False if it is not listed."""
+        row = self.row_of(task)
+        if row is None:
+            return False
+        self._tasks[row] = task
+        self._resize_row(
+            row, _row_height(task) - (self._starts[row + 1] - self._starts[row])
+        )
+        return True
+
+    def insert_task(self, task: TaskSummary) -> None:
+        """Add a row for ``task`` where the newest-first order puts it."""
+        row = len(self._tasks) if self._ranked else self._bisect(task)
+        self._tasks.insert(row, task)
+        self._starts.insert(row + 1, self._starts[row])
+        self._resize_row(row, _row_height(task))
+        if self.index is None:
+            self.index = 0
+        elif row <= self.index:
+            self.index += 1
+
+    def remove_task(self, task: TaskSummary) -> bool:
+        """Drop the row of ``task``; False if it is not listed."""
+        row = self.row_of(task)
+        if row is None:
+            return False
+        self._remove_row(row)
+        return True
+
+    def remove_id(self, task_id: str) -> bool:
+        """Like ``remove_task`` when only the id is known, at the cost of a scan."""
+        row = next((i for i, t in enumerate(self._tasks) if t.id == task_id), None)
+        if row is None:
+            return False
+        self._remove_row(row)
+        return True
+
+    def _remove_row(self, row: int) -> None:
+        self._resize_row(row, self._starts[row] - self._starts[row + 1])
+        del self._tasks[row]
+        del self._starts[row + 1]
+        if self.hover_index is not None and self.hover_index >= len(self._tasks):
+            self.hover_index = None
+        if self.index is not None and row < self.index:
+            self.index -= 1
+        else:
+            # Re-clamp: the last row may have gone.
+            self.index = self.index
+
+    def _resize_row(self, row: int, delta: int) -> None:
+        """Grow (or shrink) a row by ``delta`` lines, shifting the rows below.
+
+        The view is scrolled along when the change is above it, so what is
+        on screen stays put.
+        """
+        if delta:
+            starts = self._starts
+            starts[row + 1 :] = [start + delta for start in starts[row + 1 :]]
+            self.virtual_size = Size(self.size.width, starts[-1])
+            if starts[row] < self.scroll_offset.y:
+                self.scroll_to(
+                    y=self.scroll_offset.y + delta, animate=False, immediate=True
+                )
+        self._line_cache.clear()
+        self.refresh()
+
+    # ── cursor ─────────────────────────────────────
+
+    def validate_index(self, index: int | None) -> int | None:
+        if index is None or not self._tasks:
+            return None
+        return max(0, min(index, len(self._tasks) - 1))
+
+    def watch_index(self, old: int | None, new: int | None) -> None:
+        self._refresh_row(old)
+        self._refresh_row(new)
+        if new is not None:
+            self._scroll_to_row(new)
+
+    def watch_hover_index(self, old: int | None, new: int | None) -> None:
+        self._refresh_row(old)
+        self._refresh_row(new)
+
+    def action_cursor_down(self) -> None:
+        if self._tasks:
+            self.index = 0 if self.index is None else self.index + 1
+
+    def action_cursor_up(self) -> None:
+        if self._tasks:
+            self.index = 0 if self.index is None else self.index - 1
+
+    def _refresh_row(self, index: int | None) -> None:
+        if index is None or index >= len(self._tasks):
+            return
+        start = self._starts[index]
+        self.refresh_lines(start, self._starts[index + 1] - start)
+
+    def _scroll_to_row(self, index: int) -> None:
+        start = self._starts[index]
+        region = Region(0, start, self.size.width, self._starts[index + 1] - start)
+        self.scroll_to_region(region, animate=False, force=True, immediate=True)
+
+    def _row_at(self, y: int) -> int | None:
+        line = self.scroll_offset.y + y
+        if line < 0 or line >= self._starts[-1]:
+            return None
+        return bisect_right(self._starts, line) - 1
+
+    # ── mouse ──────────────────────────────────────
+
+    def on_mouse_move(self, event: events.MouseMove) -> None:
+        self.hover_index = self._row_at(event.y)
+
+    def on_leave(self, event: events.Leave) -> None:
+        self.hover_index = None
+
+    def on_click(self, event: events.Click) -> None:
+        row = self._row_at(event.y)
+        if row is not None:
+            self.index = row
+
+    # ── rendering ──────────────────────────────────
+
+    def notify_style_update(self) -> None:
+        super().notify_style_update()
+        self._line_cache.clear()
+
+    def on_resize(self, event: events.Resize) -> None:
+        self._line_cache.clear()
+        self.virtual_size = Size(event.size.width, self._starts[-1])
+
+    def render_line(self, y: int) -> Strip:
+        width = self.size.width
+        line = self.scroll_offset.y + y
+        if line >= self._starts[-1]:
+            return Strip.blank(width, self.get_component_rich_style("task-list--row"))
+        index = bisect_right(self._starts, line) - 1
+        offset = line - self._starts[index]
+        state = (
+            "highlight"
+            if index == self.index
+            else "hover"
+            if index == self.hover_index
+            else "row"
+        )
+        task = self._tasks[index]
+        key = (task.id, offset, state, width)
+        strip = self._line_cache.get(key)
+        if strip is None:
+            strip = self._render_row_line(task, offset, state, width)
+            self._line_cache[key] = strip
+        return strip
+
+    def _render_row_line(
+        self, task: TaskSummary, offset: int, state: str, width: int
+    ) -> Strip:
+        style = self.get_component_rich_style
+        base = style(f"task-list--{state}")
+        background = Style(bgcolor=base.bgcolor)
+        border = Segment(
+            " " if state == "row" else "█", Style(color=base.color) + background
+        )
+        inner = width - 3
+
+        if offset == 1:
+            label = STATUS_LABELS[task.status]
+            title = (
+                "task-list--title-done"
+                if task.status == TaskStatus.DONE
+                else "task-list--title"
+            )
+            segments = [
+                Segment(
+                    _fit(STATUS_ICONS[task.status], _ICON_WIDTH),
+                    background + style(f"task-list--{label}"),
+                ),
+                Segment(
+                    _fit(task.title, inner - _ICON_WIDTH - _TIME_WIDTH),
+                    background + style(title),
+                ),
+                Segment(
+                    _relative_time(task.updated_at).rjust(_TIME_WIDTH)[:_TIME_WIDTH],
+                    background + style("task-list--time"),
+                ),
+            ]
+        elif offset == 2 and task.preview:
+            desc = task.preview
+            if len(desc) > DESC_WIDTH:
+                desc = desc[:DESC_WIDTH] + "…"
+            segments = [
+                Segment(" " * _ICON_WIDTH, background),
+                Segment(
+                    _fit(desc, inner - _ICON_WIDTH),
+                    background + style("task-list--desc"),
+                ),
+            ]
+        else:
+            segments = [Segment(" " * max(inner, 0), background)]
+
+        pad = Segment(" ", background)
+        return Strip([border, pad, *segments, pad], width).crop_extend(
+            0, width, background
+        )